@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+#
+# GNU General Public License v3.0 (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+
+class ModuleDocFragment(object):
+    # Options shared by every metadata/spec object module
+    DOCUMENTATION = r'''
+options:
+    metadata:
+        annotations:
+            description:
+                - Annotations is an unstructured key value map stored with a resource
+                  that may be set by external tools to store and retrieve arbitrary metadata.
+                  They are not queryable and should be preserved when modifying objects.
+            type: object
+        description:
+            description:
+                - Human readable description for the object
+            type: str
+        disable:
+            description:
+                - A value of true will administratively disable the object
+            type: bool
+        labels:
+            description:
+                - Map of string keys and values that can be used to organize and categorize (scope and select)
+                  objects as chosen by the user. Values specified here will be used by selector expression
+            type: object
+        name:
+            type: str
+            required: True
+            description:
+                - This is the name of configuration object. It has to be unique within the namespace.
+                  It can only be specified during create API and cannot be changed during replace API.
+                  The value of name has to follow DNS-1035 format.
+        namespace:
+            description:
+                - This defines the workspace within which each the configuration object is to be created.
+                  Must be a DNS_LABEL format
+            type: str
+    state:
+        description:
+            - When C(state) is C(present), ensures the object is created or modified.
+            - When C(state) is C(absent), ensures the object is removed.
+            - When C(state) is C(fetch), returns the object.
+        type: str
+        choices:
+          - present
+          - absent
+          - fetch
+        default: present
+'''
+
+    PATCH = r'''
+options:
+    patch:
+        type: bool
+        description:
+            - Merge changes with existing on cloud when True
+            - Lists are replaced as a whole, unless C(list_merge) is C(merge).
+        default: False
+    list_merge:
+        type: str
+        description:
+            - With C(patch), how lists of named entries are merged.
+            - C(replace) replaces every list as a whole.
+            - C(merge) merges them entry by entry, other lists are still replaced.
+              Entries are matched by C(metadata.name), C(name), or C(pool.namespace) and C(pool.name) together.
+            - "With C(merge), an entry with C(state: absent) removes the matching entry from the list."
+        choices:
+          - merge
+          - replace
+        default: replace
+'''
+
+    WAIT = r'''
+options:
+    wait:
+        description:
+            - Wait until the object will be created on cloud.
+        type: bool
+        default: False
+'''
@@ -0,0 +1,269 @@
+# -*- coding: utf-8 -*-
+#
+# GNU General Public License v3.0 (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import time
+
+from ..module_utils.common import F5ModuleError
+from ..module_utils.concurrency import run_parallel
+from ..module_utils.graph import dependency_levels, object_key, references
+from ..module_utils.kinds import KINDS, get_kind
+
+
+class BatchItem(object):
+    """One object of a batch: its ConfigKind, module style params and key."""
+    __slots__ = ('kind', 'params', 'key', 'level')
+
+    def __init__(self, kind, params):
+        self.kind = get_kind(kind) if isinstance(kind, str) else kind
+        self.params = params
+        self.key = object_key(self.kind.kind, params.get('metadata'))
+        self.level = None
+
+    @property
+    def dependencies(self):
+        return references(self.kind, self.params)
+
+    def describe(self):
+        return dict(kind=self.key[0], namespace=self.key[1] or None, name=self.key[2])
+
+
+def plan(items, reverse=False):
+    """Order ``items`` into levels of objects that do not refer to each other.
+
+    Objects come after the objects they refer to, or before them with
+    ``reverse`` (for removal). References to objects outside ``items`` are
+    assumed to be satisfied already.
+    """
+    by_key = {}
+    for item in items:
+        if not item.key[2]:
+            raise F5ModuleError("metadata.name is required for {0} objects".format(item.key[0]))
+        if item.key in by_key:
+            raise F5ModuleError("{0} {1} is listed more than once".format(
+                item.key[0], '/'.join(part for part in item.key[1:] if part)))
+        by_key[item.key] = item
+    if reverse:
+        dependencies = dict((key, []) for key in by_key)
+        for item in items:
+            for dep in item.dependencies:
+                if dep in dependencies:
+                    dependencies[dep].append(item.key)
+    else:
+        dependencies = dict((item.key, item.dependencies) for item in items)
+    levels = [[by_key[key] for key in level] for level in dependency_levels(dependencies)]
+    for n, level in enumerate(levels):
+        for item in level:
+            item.level = n
+    return levels
+
+
+def removal_tiers():
+    """Removal order of kinds as ``{kind: tier}``.
+
+    A kind comes after every kind whose objects can refer to it (load
+    balancers before origin pools before health checks), and tenant level
+    kinds such as ``namespace`` come last.
+    """
+    dependencies = {}
+    for kind in list(KINDS.values()):
+        dependencies.setdefault(kind.kind, [])
+        for path, ref_kind in kind.references:
+            dependencies.setdefault(ref_kind, []).append(kind.kind)
+    levels = dependency_levels(dependencies)
+    tiers = {}
+    for n, level in enumerate(levels):
+        for kind in level:
+            tiers[kind] = n
+    for kind in KINDS.values():
+        if not kind.namespaced:
+            tiers[kind.kind] = len(levels)
+    return tiers
+
+
+def removal_levels(items):
+    """Group ``items`` for removal by the tier of their kind.
+
+    Unlike ``plan`` this needs no ``spec``, so it also orders objects known
+    only from a listing.
+    """
+    tiers = removal_tiers()
+    grouped = {}
+    for item in items:
+        grouped.setdefault(tiers.get(item.key[0], 0), []).append(item)
+    levels = [grouped[tier] for tier in sorted(grouped)]
+    for n, level in enumerate(levels):
+        for item in level:
+            item.level = n
+    return levels
+
+
+def list_objects(client, kind, namespace, full=False):
+    """Objects of ``kind`` in ``namespace`` as returned by the list API.
+
+    With ``full`` the API is asked for the ``get_spec`` and
+    ``system_metadata`` of every object too, saving a read per object.
+    """
+    url = kind.collection(dict(namespace=namespace))
+    if full:
+        url += '?report_fields'
+    response = client.api.get(url=url)
+    if response.status == 404:
+        return []
+    if response.status not in [200, 201, 202]:
+        raise F5ModuleError(response.content)
+    return response.json().get('items') or []
+
+
+def list_namespaces(client):
+    """Names of the namespaces of the tenant."""
+    return [obj.get('name') for obj in list_objects(client, KINDS['namespace'], None)]
+
+
+def fetch_object(client, item):
+    """The object ``item`` refers to as stored on cloud, or None if it is gone."""
+    response = client.api.get(url=item.kind.item(item.params.get('metadata') or {}))
+    if response.status == 404:
+        return None
+    if response.status not in [200, 201, 202]:
+        raise F5ModuleError(response.content)
+    return response.json()
+
+
+def live_items(client, scopes, selector=None, workers=8, full=False):
+    """BatchItems for the objects found in ``scopes``.
+
+    ``scopes`` is a list of ``(kind, namespace)`` pairs, each listed once and
+    concurrently. Objects whose labels do not match every ``selector`` label,
+    and objects owned by a view (created and removed along with another
+    object), are left out. ``system_metadata`` is kept where the listing
+    reports it, which it does with ``full`` (see ``list_objects``).
+    """
+    scopes = list(scopes)
+    listings = run_parallel(lambda scope: list_objects(client, scope[0], scope[1], full=full), scopes, workers)
+    result = []
+    for (kind, namespace), (listing, error) in zip(scopes, listings):
+        if error is not None:
+            raise error
+        for obj in listing:
+            labels = obj.get('labels') or {}
+            if obj.get('owner_view'):
+                continue
+            if selector and any(labels.get(k) != v for k, v in selector.items()):
+                continue
+            metadata = dict(namespace=obj.get('namespace') or namespace, name=obj.get('name'), labels=labels)
+            result.append(BatchItem(kind, dict(
+                state='absent', metadata=metadata, system_metadata=obj.get('system_metadata') or {}
+            )))
+    return result
+
+
+def wait_removed(client, items, timeout=900, workers=8, lister=list_objects):
+    """Wait until none of ``items`` is listed any more.
+
+    Each round lists every ``(kind, namespace)`` the pending items live in
+    once, instead of reading the objects one by one, and the pause between
+    rounds doubles up to 15 seconds. Raises F5ModuleError naming the
+    objects still present after ``timeout`` seconds.
+    """
+    pending = set(item.key for item in items)
+    scopes = []
+    for item in items:
+        scope = (item.kind, item.key[1] or None)
+        if scope not in scopes:
+            scopes.append(scope)
+    deadline = time.time() + timeout
+    delay = 1
+    while True:
+        live = set()
+        listings = run_parallel(lambda scope: lister(client, scope[0], scope[1]), scopes, workers)
+        for (kind, namespace), (listing, error) in zip(scopes, listings):
+            if error is not None:
+                raise error
+            for obj in listing:
+                live.add(object_key(kind.kind, dict(namespace=namespace, name=obj.get('name'))))
+        pending &= live
+        if not pending:
+            return
+        if time.time() + delay > deadline:
+            raise F5ModuleError("Timed out waiting for removal of {0}".format(', '.join(
+                '{0} {1}'.format(key[0], key[2]) for key in sorted(pending)
+            )))
+        scopes = [scope for scope in scopes if any(key[0] == scope[0].kind for key in pending)]
+        time.sleep(delay)
+        delay = min(delay * 2, 15)
+
+
+def inventory(client, namespaces=None, kinds=None, selector=None, workers=8, full=False):
+    """BatchItems for every object of ``kinds`` in ``namespaces``.
+
+    Both default to everything: all namespaces of the tenant and all kinds
+    of the registry. Namespaces themselves are included as objects of kind
+    ``namespace`` when that kind is requested and no ``selector`` is set.
+    ``full`` is passed on to ``live_items`` and to the namespace listing, so
+    namespaces carry ``system_metadata`` like the other objects.
+    """
+    kinds = [get_kind(kind) for kind in kinds or list(KINDS)]
+    with_namespaces = KINDS['namespace'] in kinds and not selector
+    listed = None
+    if with_namespaces or not namespaces:
+        listed = dict((obj.get('name'), obj) for obj in list_objects(client, KINDS['namespace'], None, full=full))
+    namespaces = namespaces or list(listed)
+    scopes = []
+    for kind in kinds:
+        if kind.namespaced:
+            scopes.extend((kind, namespace) for namespace in namespaces)
+    items = []
+    if with_namespaces:
+        items.extend(
+            BatchItem(KINDS['namespace'], dict(
+                metadata=dict(name=name), system_metadata=listed[name].get('system_metadata') or {}
+            ))
+            for name in namespaces if name in listed
+        )
+    items.extend(live_items(client, scopes, selector, workers, full=full))
+    return items
+
+
+def run_levels(levels, action, workers=8, settle=None):
+    """Run ``action(item)`` for each level in turn, items of a level concurrently.
+
+    ``action`` returns a dict merged into the item's result. ``settle``, if
+    given, is called with the items of a level that succeeded before the
+    next level starts, e.g. to wait for their removal to complete; it fails
+    the level by raising F5ModuleError. A level with failures is the last
+    one run, since later levels may depend on it.
+    Returns ``(results, timings, failed)``.
+    """
+    results = []
+    timings = []
+    failed = False
+    for n, level in enumerate(levels):
+        start = time.time()
+        outcomes = run_parallel(action, level, workers)
+        timing = dict(level=n, objects=len(level))
+        done = []
+        for item, (result, error) in zip(level, outcomes):
+            entry = item.describe()
+            entry.update(level=n, changed=False)
+            if error is not None:
+                entry.update(failed=True, msg=str(error))
+                failed = True
+            else:
+                entry.update(result or {})
+                done.append(item)
+            results.append(entry)
+        if settle is not None and done:
+            try:
+                settle(done)
+            except F5ModuleError as ex:
+                timing.update(failed=True, msg=str(ex))
+                failed = True
+        timing.update(seconds=round(time.time() - start, 3))
+        timings.append(timing)
+        if failed:
+            break
+    return results, timings, failed
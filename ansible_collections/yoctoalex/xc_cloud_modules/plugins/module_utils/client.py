@@ -7,9 +7,15 @@ from __future__ import absolute_import, division, print_function
 __metaclass__ = type
 
 import os
+import socket
+import ssl
+import threading
 from ..module_utils.constants import BASE_HEADERS
 
+from ansible.module_utils.six.moves import http_client
 from ansible.module_utils.six.moves.urllib.error import HTTPError
+from ansible.module_utils.six.moves.urllib.parse import urlparse
+from ansible.module_utils.six.moves.urllib.request import getproxies, proxy_bypass
 from ansible.module_utils.urls import Request
 
 try:
@@ -25,6 +31,9 @@ class XcRestClient(object):
         self.provider = self.params.get('provider', None)
         self.api_token = self.merge_provider_api_token_param(self.provider)
         self.tenant = self.merge_provider_tenant_param(self.provider)
+        self.validate_certs = (self.provider or {}).get('validate_certs') is not False
+        self.pool_size = self.params.get('pool_size', None)
+        self._api = None
 
     @staticmethod
     def validate_params(key, store):
@@ -51,10 +60,17 @@ class XcRestClient(object):
 
     @property
     def api(self):
-        return RestApi(
-            headers={"Authorization": "APIToken {0}".format(self.api_token)},
-            host=self.tenant
-        )
+        # With ``pool_size`` the client keeps HTTPS connections alive and can
+        # be shared by worker threads; otherwise every request opens its own.
+        if self._api is None:
+            headers = {"Authorization": "APIToken {0}".format(self.api_token)}
+            if self.pool_size:
+                self._api = PooledRestApi(
+                    headers=headers, host=self.tenant, size=self.pool_size, validate_certs=self.validate_certs
+                )
+            else:
+                self._api = RestApi(headers=headers, host=self.tenant, validate_certs=self.validate_certs)
+        return self._api
 
 
 class RestApi(object):
@@ -101,6 +117,7 @@ class RestApi(object):
         body = None
         data = kwargs.pop('data', None)
         json = kwargs.pop('json', None)
+        stream = kwargs.pop('stream', False)
 
         if not data and json is not None:
             self.request.headers.update(BASE_HEADERS)
@@ -145,6 +162,13 @@ class RestApi(object):
             self.update_response(response, e)
             return response
 
+        if stream:
+            response.headers = self.get_headers(result)
+            response.status = result.getcode()
+            response.url = result.geturl()
+            response.raw = result
+            response._close = result.close
+            return response
         self.update_response(response, result)
         return response
 
@@ -164,6 +188,139 @@ class RestApi(object):
         return self.send('PUT', f"https://{self.host}{url}", data=data, **kwargs)
 
 
+class PooledRestApi(object):
+    """Thread-safe replacement for ``RestApi`` that reuses HTTPS connections.
+
+    Up to ``size`` requests run at once, each on a connection taken from an
+    idle list and returned to it afterwards, so batch modules pay the TCP and
+    TLS handshake once per connection instead of once per request. A request
+    sent with ``stream=True`` holds its connection until the body has been
+    read with ``Response.iter_content`` or the response is closed.
+
+    A request that fails on a reused connection, which the server may have
+    closed while it was idle, is sent again on a fresh one if it never left
+    the client or its method is idempotent.
+    """
+    IDEMPOTENT_METHODS = ('GET', 'HEAD', 'PUT', 'DELETE', 'OPTIONS')
+
+    def __init__(self, headers=None, host=None, size=8, timeout=120, validate_certs=True):
+        self.headers = dict(headers or {})
+        self.host = host
+        self.timeout = timeout
+        self.context = ssl.create_default_context()
+        if not validate_certs:
+            self.context.check_hostname = False
+            self.context.verify_mode = ssl.CERT_NONE
+        self.last_url = None
+        self._idle = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(size)
+
+    def _connect(self):
+        proxy = None
+        if not proxy_bypass(self.host.split(':')[0]):
+            proxy = getproxies().get('https')
+        if proxy:
+            proxy = urlparse(proxy)
+            port = proxy.port or (443 if proxy.scheme == 'https' else 80)
+            connection = http_client.HTTPSConnection(
+                proxy.hostname, port, timeout=self.timeout, context=self.context
+            )
+            connection.set_tunnel(self.host)
+            return connection
+        return http_client.HTTPSConnection(self.host, timeout=self.timeout, context=self.context)
+
+    def _acquire(self):
+        with self._lock:
+            if self._idle:
+                return self._idle.pop(), True
+        return self._connect(), False
+
+    def _release(self, connection):
+        with self._lock:
+            self._idle.append(connection)
+
+    def send(self, method, url, **kwargs):
+        response = Response()
+
+        self.last_url = url
+
+        headers = dict(self.headers)
+        headers.update(kwargs.pop('headers', None) or {})
+        body = kwargs.pop('data', None)
+        json = kwargs.pop('json', None)
+        stream = kwargs.pop('stream', False)
+        if not body and json is not None:
+            headers.update(BASE_HEADERS)
+            body = _json.dumps(json)
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+
+        parsed = urlparse(url)
+        path = parsed.path + ('?' + parsed.query if parsed.query else '')
+
+        self._slots.acquire()
+        try:
+            connection, reused = self._acquire()
+            while True:
+                sent = False
+                try:
+                    connection.request(method, path, body=body, headers=headers)
+                    sent = True
+                    result = connection.getresponse()
+                    stream = stream and result.status < 400
+                    content = None if stream else result.read()
+                    break
+                except (http_client.HTTPException, socket.error):
+                    connection.close()
+                    if not reused or (sent and method not in self.IDEMPOTENT_METHODS):
+                        raise
+                    # The server closed an idle keep-alive connection; retry
+                    # once on a fresh one.
+                    connection, reused = self._connect(), False
+        except Exception:
+            self._slots.release()
+            raise
+
+        def finish():
+            # A streamed body that was not read to the end leaves the
+            # connection unusable for the next request.
+            if result.will_close or not result.isclosed():
+                connection.close()
+            else:
+                self._release(connection)
+            self._slots.release()
+
+        if stream:
+            response.raw = result
+            response._close = finish
+        else:
+            finish()
+
+        response.headers = dict(result.getheaders())
+        response._content = content
+        response.status = result.status
+        response.reason = result.reason
+        response.url = url
+        response.msg = "OK (%s bytes)" % response.headers.get('Content-Length', 'unknown')
+        return response
+
+    def delete(self, url, **kwargs):
+        return self.send('DELETE', f"https://{self.host}{url}", **kwargs)
+
+    def get(self, url, **kwargs):
+        return self.send('GET', f"https://{self.host}{url}", **kwargs)
+
+    def patch(self, url, data=None, **kwargs):
+        return self.send('PATCH', f"https://{self.host}{url}", data=data, **kwargs)
+
+    def post(self, url, data=None, **kwargs):
+        return self.send('POST', f"https://{self.host}{url}", data=data, **kwargs)
+
+    def put(self, url, data=None, **kwargs):
+        return self.send('PUT', f"https://{self.host}{url}", data=data, **kwargs)
+
+
 class Response(object):
     def __init__(self):
         self._content = None
@@ -173,11 +330,30 @@ class Response(object):
         self.reason = None
         self.request = None
         self.msg = None
+        self.raw = None
+        self._close = None
 
     @property
     def content(self):
         return self._content
 
+    def iter_content(self, size):
+        """Body in chunks of up to ``size`` bytes, read as they arrive with ``stream=True``."""
+        if self.raw is None:
+            if self._content:
+                yield self._content
+            return
+        try:
+            for chunk in iter(lambda: self.raw.read(size), b''):
+                yield chunk
+        finally:
+            self.close()
+
+    def close(self):
+        if self._close is not None:
+            self._close()
+            self._close = None
+
     @property
     def raw_content(self):
         return self._content
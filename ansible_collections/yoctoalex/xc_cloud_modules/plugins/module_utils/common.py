@@ -7,73 +7,138 @@ from __future__ import absolute_import, division, print_function
 __metaclass__ = type
 
 from ansible.module_utils.basic import env_fallback
-from ansible.module_utils.six import iteritems
-from collections import defaultdict
+from ansible.module_utils.six import add_metaclass, iteritems
 
 
+class ParameterValues(dict):
+    """Value store that answers ``None`` for unknown keys.
+
+    Unlike ``defaultdict(lambda: None)`` a miss does not insert the key,
+    so reading optional attributes does not grow the store.
+    """
+    __slots__ = ()
+
+    def __missing__(self, key):
+        return None
+
+
+class ParametersMeta(type):
+    """Gives every parameters class an empty ``__slots__`` unless it declares one.
+
+    Modules subclass ``AnsibleF5Parameters`` several levels deep; without this
+    each level would silently reintroduce a per-instance ``__dict__``.
+
+    The metaclass also compiles, once per class, the attribute readers used by
+    ``api_params()``, ``to_return()`` and ``to_update()``, and gives the class
+    its own cache of how ``update()`` stores each incoming key.
+    """
+    def __new__(mcs, name, bases, namespace):
+        namespace.setdefault('__slots__', ())
+        return super(ParametersMeta, mcs).__new__(mcs, name, bases, namespace)
+
+    def __init__(cls, name, bases, namespace):
+        super(ParametersMeta, cls).__init__(name, bases, namespace)
+        api_map = cls.api_map or {}
+        cls._api_readers = tuple(
+            (attr, cls._compile_reader(api_map.get(attr, attr))) for attr in cls.api_attributes
+        )
+        cls._return_readers = tuple((attr, cls._compile_reader(attr)) for attr in cls.returnables)
+        cls._update_readers = tuple((attr, cls._compile_reader(attr)) for attr in cls.updatables)
+        cls._writers = {}
+
+    def _compile_reader(cls, attr):
+        class_attr = getattr(cls, attr, None)
+        if isinstance(class_attr, property) and class_attr.fget is not None:
+            return class_attr.fget
+        if class_attr is not None:
+            return lambda obj: getattr(obj, attr)
+        return lambda obj: obj._values[attr]
+
+    def _compile_writer(cls, key):
+        # Adding this here because ``username`` is a connection parameter
+        # and in cases where it is also an API parameter, we run the risk
+        # of overriding the specified parameter with the connection parameter.
+        #
+        # Since this is a problem, and since "username" is never a valid
+        # parameter outside its usage in connection params (where we do not
+        # use the ApiParameter or ModuleParameters classes) it is safe to
+        # skip over it if it is provided.
+        if key in ('password', 'api_token'):
+            return None
+        if cls.api_map is not None and key in cls.api_map:
+            map_key = cls.api_map[key]
+        else:
+            map_key = key
+
+        # Handle weird API parameters like `dns.proxy.__iter__` by
+        # using a map provided by the module developer
+        class_attr = getattr(cls, map_key, None)
+        if isinstance(class_attr, property) and class_attr.fset is not None:
+            # The mapped value has a setter
+            return map_key, class_attr.fset
+        # The mapped value is not a @property, or has no setter
+        return map_key, None
+
+
+@add_metaclass(ParametersMeta)
 class AnsibleF5Parameters(object):
+    __slots__ = ('_values', 'client', '_module')
+
+    api_map = None
+    api_attributes = []
+    updatables = []
+    returnables = []
+
     def __init__(self, *args, **kwargs):
-        self._values = defaultdict(lambda: None)
-        self._values['__warnings'] = []
+        self._values = ParameterValues()
         self.client = kwargs.pop('client', None)
         self._module = kwargs.pop('module', None)
-        self._params = {}
 
         params = kwargs.pop('params', None)
         if params:
             self.update(params=params)
-            self._params.update(params)
 
     def update(self, params=None):
         if params:
-            self._params.update(params)
+            cls = type(self)
+            writers = cls._writers
+            values = self._values
             for k, v in iteritems(params):
-                # Adding this here because ``username`` is a connection parameter
-                # and in cases where it is also an API parameter, we run the risk
-                # of overriding the specified parameter with the connection parameter.
-                #
-                # Since this is a problem, and since "username" is never a valid
-                # parameter outside its usage in connection params (where we do not
-                # use the ApiParameter or ModuleParameters classes) it is safe to
-                # skip over it if it is provided.
-                if k == 'password':
-                    continue
-                if k == 'api_token':
+                try:
+                    writer = writers[k]
+                except KeyError:
+                    writer = writers[k] = cls._compile_writer(k)
+                if writer is None:
                     continue
-                if self.api_map is not None and k in self.api_map:
-                    map_key = self.api_map[k]
+                map_key, setter = writer
+                if setter is None:
+                    values[map_key] = v
                 else:
-                    map_key = k
-
-                # Handle weird API parameters like `dns.proxy.__iter__` by
-                # using a map provided by the module developer
-                class_attr = getattr(type(self), map_key, None)
-                if isinstance(class_attr, property):
-                    # There is a mapped value for the api_map key
-                    if class_attr.fset is None:
-                        # If the mapped value does not have
-                        # an associated setter
-                        self._values[map_key] = v
-                    else:
-                        # The mapped value has a setter
-                        setattr(self, map_key, v)
-                else:
-                    # If the mapped value is not a @property
-                    self._values[map_key] = v
+                    setter(self, v)
 
     def api_params(self):
+        return self._read(self._api_readers)
+
+    def to_return(self):
+        return self._read(self._return_readers)
+
+    def to_update(self):
+        return self._read(self._update_readers)
+
+    def _read(self, readers):
         result = {}
-        for api_attribute in self.api_attributes:
-            if self.api_map is not None and api_attribute in self.api_map:
-                result[api_attribute] = getattr(self, self.api_map[api_attribute])
-            else:
-                result[api_attribute] = getattr(self, api_attribute)
-        result = self._filter_params(result)
+        for attr, reader in readers:
+            value = reader(self)
+            if value is not None:
+                result[attr] = value
         return result
 
     def __getattr__(self, item):
         # Ensures that properties that weren't defined, and therefore stashed
         # in the `_values` dict, will be retrievable.
+        if item == '_values':
+            # Only reachable before __init__ ran (copy, pickle); avoid recursing.
+            raise AttributeError(item)
         return self._values[item]
 
     def _filter_params(self, params):
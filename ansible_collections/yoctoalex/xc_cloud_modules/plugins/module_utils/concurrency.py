@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+#
+# GNU General Public License v3.0 (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+def run_parallel(func, items, workers=8):
+    """Call ``func`` on every item using up to ``workers`` threads.
+
+    Returns ``(result, error)`` pairs in the order of ``items``; an exception
+    raised for one item is captured as its ``error`` and does not stop the
+    others. With a single worker or item everything runs in the caller's
+    thread.
+    """
+    items = list(items)
+
+    def call(item):
+        try:
+            return func(item), None
+        except Exception as ex:
+            return None, ex
+
+    if workers <= 1 or len(items) <= 1:
+        return [call(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(workers, len(items))) as executor:
+        return list(executor.map(call, items))
+
+
+def imap_unordered(func, items, workers=8, window=None):
+    """Yield ``(item, result, error)`` for every item as its call completes.
+
+    ``items`` is consumed lazily and at most ``window`` (default twice
+    ``workers``) calls are pending at any time, so memory stays bounded by
+    the window however many items there are.
+    """
+    window = window or workers * 2
+    items = iter(items)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = {}
+        exhausted = False
+        while pending or not exhausted:
+            while not exhausted and len(pending) < window:
+                try:
+                    item = next(items)
+                except StopIteration:
+                    exhausted = True
+                    break
+                pending[executor.submit(func, item)] = item
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                item = pending.pop(future)
+                error = future.exception()
+                yield item, (None if error else future.result()), error
+
+
+class RateLimiter(object):
+    """Space out calls made from several threads to at most ``rate`` per second.
+
+    Every ``wait()`` reserves the next free slot and sleeps until it comes;
+    a ``rate`` of None or 0 does not limit.
+    """
+    def __init__(self, rate=None):
+        self.interval = 1.0 / rate if rate else 0
+        self._lock = threading.Lock()
+        self._next = 0
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.time()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
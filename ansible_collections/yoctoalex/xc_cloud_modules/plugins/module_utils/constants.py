@@ -7,3 +7,8 @@ from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
 BASE_HEADERS = {'Content-Type': 'application/json'}
+
+# Keys tried, in order, to match list entries when ``patch`` merges a list of
+# objects (e.g. service policy rules or default route pools). Pools of the
+# same name may live in different namespaces, so both identify a pool.
+PATCH_LIST_KEYS = ('metadata.name', 'name', ('pool.namespace', 'pool.name'))
@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+#
+# GNU General Public License v3.0 (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import calendar
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+
+from ..module_utils.common import F5ModuleError
+
+API_CREDENTIALS_URI = '/api/web/namespaces/{namespace}/api_credentials'
+REVOKE_URI = '/api/web/namespaces/{namespace}/revoke/api_credentials'
+
+TIMESTAMP = re.compile(r'(\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d)(\.\d+)?(Z|[+-]\d\d:\d\d)?$')
+
+
+def parse_timestamp(value):
+    """Seconds since the epoch of an RFC 3339 timestamp as the API reports it, or None."""
+    match = TIMESTAMP.match(value or '')
+    if not match:
+        return None
+    seconds = calendar.timegm(time.strptime(match.group(1), '%Y-%m-%dT%H:%M:%S'))
+    if match.group(2):
+        seconds += float(match.group(2))
+    offset = match.group(3)
+    if offset and offset != 'Z':
+        sign = 1 if offset[0] == '+' else -1
+        seconds -= sign * (int(offset[1:3]) * 3600 + int(offset[4:6]) * 60)
+    return seconds
+
+
+def expiry(credential):
+    """Seconds since the epoch at which a listed credential expires, or None."""
+    return parse_timestamp(credential.get('expiry_timestamp') or credential.get('expiration_timestamp'))
+
+
+def list_credentials(client, namespace):
+    """Credentials of ``namespace`` as returned by the list API."""
+    response = client.api.get(url=API_CREDENTIALS_URI.format(namespace=namespace))
+    if response.status == 404:
+        return []
+    if response.status not in [200, 201, 202]:
+        raise F5ModuleError(response.content)
+    return response.json().get('items') or []
+
+
+def _post(client, uri, body, retries, **kwargs):
+    """POST ``body``, retrying up to ``retries`` times while the API answers 429.
+
+    The wait is as told by Retry-After, or twice as long every time.
+    """
+    delay = 1
+    for attempt in range(retries + 1):
+        response = client.api.post(url=uri, json=body, **kwargs)
+        if response.status != 429 or attempt == retries:
+            return response
+        try:
+            time.sleep(float(response.headers.get('Retry-After') or delay))
+        except ValueError:
+            time.sleep(delay)
+        delay = min(delay * 2, 30)
+
+
+def issue_credential(client, namespace, body, retries=5, stream=False):
+    """Create a credential from ``body``; returns the response.
+
+    With ``stream=True`` the body of the response is left to be read, for
+    instance with ``save_credential``.
+    """
+    response = _post(client, API_CREDENTIALS_URI.format(namespace=namespace), body, retries, stream=stream)
+    if response.status not in [200, 201, 202]:
+        raise F5ModuleError(response.content)
+    return response
+
+
+def save_credential(response, f):
+    """Write the decoded ``data`` of a create response sent with ``stream=True`` to ``f``.
+
+    The body is read and decoded in chunks. Returns the other string members
+    of the response, such as ``name`` and ``expiration_timestamp``.
+    """
+    # Imported here so that modules which only read the cache do not compile it.
+    from ..module_utils.object_store import CHUNK_SIZE, content_chunks, json_string_members
+
+    fields = {}
+
+    def data(members):
+        for name, piece in members:
+            if name == 'data':
+                yield name, piece
+            else:
+                fields[name] = fields.get(name, b'') + piece
+
+    members = json_string_members(response.iter_content(CHUNK_SIZE), ('data', 'name', 'expiration_timestamp'))
+    for chunk in content_chunks(data(members)):
+        f.write(chunk)
+    return dict((name, value.decode('utf-8')) for name, value in fields.items())
+
+
+def revoke_credential(client, namespace, name, retries=5):
+    """Revoke the credential ``name``; returns False when it does not exist.
+
+    Requests the API turns down with 429 are retried up to ``retries`` times.
+    """
+    response = _post(client, REVOKE_URI.format(namespace=namespace), dict(name=name, namespace=namespace), retries)
+    if response.status == 404:
+        return False
+    if response.status not in [200, 201, 202]:
+        raise F5ModuleError(response.content)
+    return True
+
+
+class CredentialCache(object):
+    """Credentials issued earlier, kept in a JSON file only its owner can read.
+
+    Entries are keyed by what the credential was issued for and hold the
+    ``name`` and ``data`` the create API returned plus ``expires``, seconds
+    since the epoch. Expired entries are dropped on ``save``.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        if os.path.exists(path):
+            try:
+                with open(path) as f:
+                    self.entries = json.load(f).get('credentials') or {}
+            except ValueError:
+                self.entries = {}
+
+    @staticmethod
+    def key(*parts):
+        return '|'.join('' if part is None else str(part) for part in parts)
+
+    @staticmethod
+    def secret(value):
+        """Key part standing for a secret such as a password, which the key must not hold."""
+        if value is None:
+            return None
+        return hashlib.sha256(json.dumps(value, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def get(self, key, margin=0):
+        """The entry for ``key`` if it is valid for more than ``margin`` seconds.
+
+        An entry is valid until ``expires`` and, when it records one, until
+        its ``expiration_timestamp``, whichever comes first.
+        """
+        entry = self.entries.get(key)
+        if not entry:
+            return None
+        expires = entry.get('expires', 0)
+        stated = parse_timestamp(entry.get('expiration_timestamp'))
+        if stated is not None:
+            expires = min(expires, stated)
+        if expires - margin > time.time():
+            return entry
+        return None
+
+    def put(self, key, entry):
+        self.entries[key] = entry
+
+    def discard(self, name):
+        """Forget the credential called ``name``; returns whether it was cached."""
+        keys = [key for key, entry in self.entries.items() if entry.get('name') == name]
+        for key in keys:
+            del self.entries[key]
+        return bool(keys)
+
+    def save(self):
+        """Write the cache, creating its directory if needed; raises F5ModuleError if that fails."""
+        now = time.time()
+        self.entries = dict((key, entry) for key, entry in self.entries.items() if entry.get('expires', 0) > now)
+        directory = os.path.dirname(os.path.abspath(self.path))
+        try:
+            os.makedirs(directory, 0o700, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(self.path))
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(dict(credentials=self.entries), f)
+                os.replace(tmp, self.path)
+            except Exception:
+                os.unlink(tmp)
+                raise
+        except (OSError, IOError) as ex:
+            raise F5ModuleError("Cannot save credential cache {0}: {1}".format(self.path, ex))
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+#
+# GNU General Public License v3.0 (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import bisect
+import difflib
+import json
+
+
+def canonical(value):
+    """Stable JSON text for ``value``, usable as a hash or identity key."""
+    return json.dumps(value, sort_keys=True, separators=(',', ':'))
+
+
+def changed_paths(have, want, prefix='', removed=False):
+    """Dotted paths at which ``want`` is not contained in ``have``.
+
+    Only what ``want`` states is compared, so fields the server fills in
+    (defaults, ``system_metadata``) never show up as changes. With
+    ``removed`` the fields of ``have`` that ``want`` lacks are reported too,
+    for comparing what a replace sends with what it replaces. Lists are
+    compared position by position and must have the same length.
+    """
+    result = []
+    stack = [(prefix, have, want)]
+    while stack:
+        path, left, right = stack.pop()
+        if isinstance(right, dict) and isinstance(left, dict):
+            keys = set(right).union(left) if removed else right
+            for k in sorted(keys, reverse=True):
+                child = '{0}.{1}'.format(path, k) if path else k
+                if k not in right:
+                    if left[k] is not None:
+                        result.append(child)
+                    continue
+                if k not in left:
+                    if right[k] is not None:
+                        result.append(child)
+                    continue
+                stack.append((child, left[k], right[k]))
+        elif isinstance(right, list) and isinstance(left, list):
+            if len(left) != len(right):
+                result.append(path)
+                continue
+            for i in range(len(right) - 1, -1, -1):
+                stack.append(('{0}[{1}]'.format(path, i), left[i], right[i]))
+        elif left != right:
+            result.append(path)
+    return result
+
+
+def diff_lists(old, new, key=None):
+    """Ordered diff between two lists of objects.
+
+    With ``key`` (a callable returning a hashable identity) entries are
+    matched by identity, and the result reports ``inserted``, ``removed``,
+    ``moved`` (entries that left the longest run kept in relative order) and
+    ``modified`` entries. If ``key`` is missing, or does not identify every
+    entry uniquely, entries are matched by content with a longest common
+    subsequence and ``moved`` stays empty. The ``paths`` of an entry matched
+    by identity only cover the fields ``new`` states, so the defaults the
+    server added to ``old`` are not reported; entries paired by position
+    also report the fields dropped from them.
+
+    Indexes in ``removed`` and ``moved.from`` refer to ``old``; all other
+    indexes refer to ``new``.
+    """
+    old = old or []
+    new = new or []
+    if key is not None:
+        old_index = _index(old, key)
+        new_index = _index(new, key) if old_index is not None else None
+        if new_index is not None:
+            return _keyed_diff(old, new, key, old_index, new_index)
+    return _sequence_diff(old, new)
+
+
+def _empty_diff():
+    return dict(changed=False, inserted=[], removed=[], moved=[], modified=[], unchanged=0)
+
+
+def _index(items, key):
+    index = {}
+    for i, item in enumerate(items):
+        k = key(item)
+        if k is None or k in index:
+            return None
+        index[k] = i
+    return index
+
+
+def _keyed_diff(old, new, key, old_index, new_index):
+    result = _empty_diff()
+    for i, item in enumerate(old):
+        k = key(item)
+        if k not in new_index:
+            result['removed'].append(dict(index=i, key=k))
+
+    common = []
+    for j, item in enumerate(new):
+        k = key(item)
+        i = old_index.get(k)
+        if i is None:
+            result['inserted'].append(dict(index=j, key=k, value=item))
+            continue
+        common.append((i, j, k))
+        paths = changed_paths(old[i], item)
+        if paths:
+            result['modified'].append(dict(index=j, key=k, paths=paths))
+
+    stable = _longest_increasing([i for i, j, k in common])
+    for n, (i, j, k) in enumerate(common):
+        if n not in stable:
+            result['moved'].append({'key': k, 'from': i, 'to': j})
+
+    result['unchanged'] = len(common) - len(result['modified'])
+    result['changed'] = bool(result['inserted'] or result['removed'] or result['moved'] or result['modified'])
+    return result
+
+
+def _longest_increasing(values):
+    """Positions in ``values`` forming one longest strictly increasing run."""
+    tails = []
+    tail_pos = []
+    parents = [-1] * len(values)
+    for n, value in enumerate(values):
+        slot = bisect.bisect_left(tails, value)
+        if slot == len(tails):
+            tails.append(value)
+            tail_pos.append(n)
+        else:
+            tails[slot] = value
+            tail_pos[slot] = n
+        parents[n] = tail_pos[slot - 1] if slot else -1
+    result = set()
+    n = tail_pos[-1] if tail_pos else -1
+    while n != -1:
+        result.add(n)
+        n = parents[n]
+    return result
+
+
+def _sequence_diff(old, new):
+    result = _empty_diff()
+    matcher = difflib.SequenceMatcher(
+        None, [canonical(item) for item in old], [canonical(item) for item in new], autojunk=False
+    )
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            result['unchanged'] += i2 - i1
+            continue
+        paired = min(i2 - i1, j2 - j1) if tag == 'replace' else 0
+        for n in range(paired):
+            paths = changed_paths(old[i1 + n], new[j1 + n], removed=True)
+            result['modified'].append(dict(index=j1 + n, paths=paths))
+        for i in range(i1 + paired, i2):
+            result['removed'].append(dict(index=i))
+        for j in range(j1 + paired, j2):
+            result['inserted'].append(dict(index=j, value=new[j]))
+    result['changed'] = bool(result['inserted'] or result['removed'] or result['modified'])
+    return result
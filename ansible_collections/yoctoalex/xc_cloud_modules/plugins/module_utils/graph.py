@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+#
+# GNU General Public License v3.0 (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import re
+
+from ..module_utils.common import F5ModuleError
+
+STORED_OBJECT_URL = re.compile(r'/namespaces/([^/]+)/stored_objects/[^/]+/([^/]+)')
+
+
+def object_key(kind, metadata):
+    """Identity of an object across kinds: ``(kind, namespace, name)``."""
+    metadata = metadata or {}
+    return kind, metadata.get('namespace') or '', metadata.get('name')
+
+
+def _values(value, parts):
+    """Values found at ``parts`` of a reference path; ``[]`` expands a list."""
+    stack = [(value, 0)]
+    while stack:
+        value, n = stack.pop()
+        if value is None:
+            continue
+        if n == len(parts):
+            yield value
+            continue
+        part = parts[n]
+        if part.endswith('[]'):
+            child = value.get(part[:-2]) if isinstance(value, dict) else None
+            if isinstance(child, list):
+                stack.extend((item, n + 1) for item in reversed(child))
+        elif isinstance(value, dict):
+            stack.append((value.get(part), n + 1))
+
+
+def _ref_key(kind, ref, namespace):
+    if isinstance(ref, dict):
+        if not ref.get('name'):
+            return None
+        return kind, ref.get('namespace') or namespace, ref['name']
+    if isinstance(ref, str):
+        match = STORED_OBJECT_URL.search(ref)
+        if match:
+            return kind, match.group(1), match.group(2)
+    return None
+
+
+def references(kind, obj):
+    """Keys of the objects ``obj`` (an object of ConfigKind ``kind``) refers to.
+
+    ``kind.references`` lists ``(path, kind)`` pairs. A path is dotted, with
+    ``[]`` after a part expanding a list; the value found there is an object
+    reference (``namespace``/``name``) or a stored object URL. References
+    without a namespace point into the referring object's namespace.
+    """
+    namespace = (obj.get('metadata') or {}).get('namespace') or ''
+    result = []
+    for path, ref_kind in kind.references:
+        for ref in _values(obj, path.split('.')):
+            key = _ref_key(ref_kind, ref, namespace)
+            if key is not None and key not in result:
+                result.append(key)
+    return result
+
+
+def reverse_index(objects):
+    """Map each referenced key to the keys of the objects referring to it.
+
+    ``objects`` yields ``(kind, obj)`` pairs, ``kind`` being a ConfigKind.
+    """
+    index = {}
+    for kind, obj in objects:
+        key = object_key(kind.kind, obj.get('metadata'))
+        for ref in references(kind, obj):
+            users = index.setdefault(ref, [])
+            if key not in users:
+                users.append(key)
+    return index
+
+
+def dependency_levels(dependencies):
+    """Group keys into levels that can be processed concurrently.
+
+    ``dependencies`` maps each key to the keys it depends on (in insertion
+    order); dependencies that are not keys themselves are ignored. Every
+    key lands in a later level than everything it depends on, and keys keep
+    their relative order within a level. A cycle raises F5ModuleError.
+    """
+    pending = {}
+    dependants = dict((key, []) for key in dependencies)
+    for key, deps in dependencies.items():
+        deps = set(dep for dep in deps if dep in dependants and dep != key)
+        pending[key] = len(deps)
+        for dep in deps:
+            dependants[dep].append(key)
+
+    levels = []
+    level = [key for key, count in pending.items() if count == 0]
+    done = 0
+    while level:
+        levels.append(level)
+        done += len(level)
+        ready = set()
+        for key in level:
+            for dependant in dependants[key]:
+                pending[dependant] -= 1
+                if pending[dependant] == 0:
+                    ready.add(dependant)
+        level = [key for key in dependencies if key in ready]
+
+    if done != len(dependencies):
+        cycle = [key for key, count in pending.items() if count > 0]
+        raise F5ModuleError(
+            "Circular references between {0}".format(', '.join('/'.join(part for part in key if part) for key in cycle))
+        )
+    return levels
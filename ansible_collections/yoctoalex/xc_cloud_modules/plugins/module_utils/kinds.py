@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+#
+# GNU General Public License v3.0 (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import json
+import re
+
+from ..module_utils.common import F5ModuleError
+from ..module_utils.resource import ConfigKind
+
+
+def route_key(route):
+    """Identify an http_loadbalancer route by what it matches.
+
+    A route is a single-key oneof (``simple_route``, ``redirect_route``, ...);
+    its identity is the route type plus method, path, headers and port, or
+    the referenced object for ``custom_route_object``. Values the server
+    fills in (method ``ANY``, no headers, no port match) count as unset, so
+    a route keeps its identity whether or not it was read back.
+    """
+    if not isinstance(route, dict) or len(route) != 1:
+        return None
+    kind, body = next(iter(route.items()))
+    if not isinstance(body, dict):
+        return None
+    if kind == 'custom_route_object':
+        match = body.get('route_ref')
+    else:
+        match = dict((k, body[k]) for k in ('http_method', 'path', 'headers', 'incoming_port') if body.get(k))
+        if match.get('http_method') == 'ANY':
+            del match['http_method']
+        if 'no_port_match' in (match.get('incoming_port') or {}):
+            del match['incoming_port']
+    if not match:
+        return None
+    return '{0}:{1}'.format(kind, json.dumps(match, sort_keys=True, separators=(',', ':')))
+
+
+def metadata_name_key(item):
+    """Identify a list entry such as a service policy rule by ``metadata.name``."""
+    if not isinstance(item, dict) or not isinstance(item.get('metadata'), dict):
+        return None
+    return item['metadata'].get('name')
+
+
+# Kinds served by the generic config API need only their plural here;
+# everything else about them follows the /api/config/namespaces/{namespace}
+# convention. Keys other than ``plural`` are ConfigKind arguments; the
+# ``references`` paths order objects for xc_apply and friends.
+KIND_DATA = {
+    'namespace': dict(
+        collection_uri='/api/web/namespaces',
+        item_uri='/api/web/namespaces/{name}',
+        delete_uri='/api/web/namespaces/{name}/cascade_delete',
+        delete_method='POST',
+        namespaced=False,
+        replace=False,
+        wait=True,
+    ),
+    'virtual_k8s': dict(plural='virtual_k8ss', replace=False, wait=True),
+    'origin_pool': dict(
+        plural='origin_pools',
+        defaults=dict(endpoint_selection='DISTRIBUTED', loadbalancer_algorithm='ROUND_ROBIN'),
+        references=(('spec.healthcheck[]', 'healthcheck'),),
+    ),
+    'healthcheck': dict(plural='healthchecks'),
+    'api_definition': dict(
+        plural='api_definitions',
+        references=(('spec.swagger_specs[]', 'stored_object'),),
+    ),
+    'app_firewall': dict(plural='app_firewalls'),
+    'service_policy': dict(
+        plural='service_policys',
+        list_keys=dict(rules=(('spec', 'rule_list', 'rules'), metadata_name_key)),
+        references=(
+            ('spec.rule_list.rules[].spec.ip_matcher.prefix_sets[]', 'ip_prefix_set'),
+            ('spec.allow_list.ip_prefix_set[]', 'ip_prefix_set'),
+            ('spec.deny_list.ip_prefix_set[]', 'ip_prefix_set'),
+        ),
+    ),
+    'service_policy_set': dict(
+        plural='service_policy_sets',
+        references=(('spec.policies[]', 'service_policy'),),
+    ),
+    'rate_limiter': dict(plural='rate_limiters'),
+    'rate_limiter_policy': dict(
+        plural='rate_limiter_policys',
+        references=(('spec.rules[].spec.custom_rate_limiter', 'rate_limiter'),),
+    ),
+    'ip_prefix_set': dict(plural='ip_prefix_sets'),
+    'user_identification': dict(plural='user_identifications'),
+    'app_type': dict(plural='app_types'),
+    'app_setting': dict(
+        plural='app_settings',
+        references=(('spec.app_type_settings[].app_type_ref[]', 'app_type'),),
+    ),
+    'certificate': dict(plural='certificates'),
+    'route': dict(
+        plural='routes',
+        references=(('spec.routes[].route_destination.destinations[].cluster[]', 'cluster'),),
+    ),
+    'http_loadbalancer': dict(
+        plural='http_loadbalancers',
+        list_keys=dict(routes=(('spec', 'routes'), route_key)),
+        references=(
+            ('spec.default_route_pools[].pool', 'origin_pool'),
+            ('spec.routes[].simple_route.origin_pools[].pool', 'origin_pool'),
+            ('spec.routes[].custom_route_object.route_ref', 'route'),
+            ('spec.https.tls_cert_params.certificates[]', 'certificate'),
+            ('spec.app_firewall', 'app_firewall'),
+            ('spec.active_service_policies.policies[]', 'service_policy'),
+            ('spec.api_definition', 'api_definition'),
+            ('spec.rate_limit.policies.policies[]', 'rate_limiter_policy'),
+            ('spec.rate_limit.custom_ip_allowed_list.rate_limiter_allowed_prefixes[]', 'ip_prefix_set'),
+            ('spec.user_identification', 'user_identification'),
+        ),
+    ),
+    'tcp_loadbalancer': dict(
+        plural='tcp_loadbalancers',
+        references=(
+            ('spec.origin_pools_weights[].pool', 'origin_pool'),
+            ('spec.tls_tcp.tls_cert_params.certificates[]', 'certificate'),
+        ),
+    ),
+    'cdn_loadbalancer': dict(
+        plural='cdn_loadbalancers',
+        references=(
+            ('spec.app_firewall', 'app_firewall'),
+            ('spec.active_service_policies.policies[]', 'service_policy'),
+        ),
+    ),
+}
+
+
+def _compile(kind, data):
+    data = dict(data)
+    plural = data.pop('plural', '{0}s'.format(kind))
+    data.setdefault('collection_uri', '/api/config/namespaces/{namespace}/%s' % plural)
+    data.setdefault('item_uri', '/api/config/namespaces/{namespace}/%s/{name}' % plural)
+    return ConfigKind(kind, **data)
+
+
+KINDS = dict((kind, _compile(kind, data)) for kind, data in KIND_DATA.items())
+
+KIND_NAME = re.compile(r'^[a-z][a-z0-9_]*$')
+
+_DERIVED = {}
+
+
+def get_kind(kind):
+    """Registered kind, or one derived from the config API naming convention.
+
+    Derived kinds are not added to ``KINDS``, which lists the registered ones,
+    but each is compiled once, so the same name always gives the same
+    instance and kinds can be compared and deduplicated by identity.
+    """
+    result = KINDS.get(kind) or _DERIVED.get(kind)
+    if result is None:
+        if not isinstance(kind, str) or not KIND_NAME.match(kind):
+            raise F5ModuleError("{0!r} is not a valid kind".format(kind))
+        result = _DERIVED.setdefault(kind, _compile(kind, {}))
+    return result
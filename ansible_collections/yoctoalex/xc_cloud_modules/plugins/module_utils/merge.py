@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+#
+# GNU General Public License v3.0 (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+from ..module_utils.constants import PATCH_LIST_KEYS
+
+
+def merge_dicts(base, changes, list_keys=PATCH_LIST_KEYS):
+    """Merge ``changes`` over ``base`` the way ``patch: True`` expects.
+
+    * a ``None`` value removes the key, which is how a oneof choice such as
+      ``disable_waf`` is switched off when another one is set;
+    * nested dicts are merged;
+    * lists of dicts are merged entry by entry when one of ``list_keys``
+      identifies every entry on both sides uniquely. A key is a dotted path
+      such as ``metadata.name``, a tuple of dotted paths that must all be
+      set (``('pool.namespace', 'pool.name')``), or a callable returning an
+      identity like ``kinds.route_key``. An entry of ``changes`` with
+      ``state: absent`` removes the entry with the same identity. Any other
+      list, and an empty one, is replaced;
+    * everything else in ``changes`` replaces the value in ``base``.
+
+    Pass an empty ``list_keys`` to replace every list as a whole.
+
+    The walk uses an explicit stack, so depth is not bounded by the recursion
+    limit, and subtrees present on only one side, or equal on both, are
+    shared by reference instead of being rebuilt. Neither input is modified.
+    """
+    key_funcs = _compile_list_keys(list_keys)
+    result = {}
+    stack = [(result, base or {}, changes or {})]
+    while stack:
+        target, left, right = stack.pop()
+        for k, old in left.items():
+            if k not in right:
+                if old is not None:
+                    target[k] = old
+                continue
+            new = right[k]
+            if new is None:
+                continue
+            if isinstance(old, dict) and isinstance(new, dict):
+                child = target[k] = {}
+                stack.append((child, old, new))
+            elif isinstance(old, list) and isinstance(new, list):
+                target[k] = _merge_lists(old, new, key_funcs, stack) if key_funcs else new
+            else:
+                target[k] = new
+        for k, new in right.items():
+            if k not in left and new is not None:
+                target[k] = _merge_lists([], new, key_funcs, stack) if key_funcs and isinstance(new, list) else new
+    return result
+
+
+def _compile_list_keys(list_keys):
+    return tuple(_compile_key(key) for key in list_keys or ())
+
+
+def _compile_key(key):
+    if callable(key):
+        return key
+    if isinstance(key, (tuple, list)):
+        getters = tuple(_path_getter(path) for path in key)
+
+        def composite(item):
+            values = []
+            for getter in getters:
+                value = getter(item)
+                if value is None or isinstance(value, (dict, list)):
+                    return None
+                values.append(value)
+            return tuple(values)
+        return composite
+    return _path_getter(key)
+
+
+def _path_getter(dotted):
+    path = tuple(dotted.split('.'))
+    if len(path) == 1:
+        name = path[0]
+
+        def lookup_one(item):
+            return item.get(name) if isinstance(item, dict) else None
+        return lookup_one
+
+    def lookup(item):
+        for part in path:
+            if not isinstance(item, dict):
+                return None
+            item = item.get(part)
+        return item
+    return lookup
+
+
+def _absent(item):
+    return isinstance(item, dict) and item.get('state') == 'absent'
+
+
+def _list_index(items, key):
+    """Map the identity returned by ``key`` to its entry, or ``None`` if not unique."""
+    index = {}
+    for item in items:
+        value = key(item)
+        if value is None or isinstance(value, (dict, list)) or value in index:
+            return None
+        index[value] = item
+    return index
+
+
+def _merge_lists(old, new, key_funcs, stack):
+    if not new:
+        return new
+    for key in key_funcs:
+        # Most lists (routes, domains, ...) are not keyed at all; looking at
+        # the first entries rules a key out without indexing the lists.
+        if key(new[0]) is None:
+            continue
+        if old and key(old[0]) is None:
+            continue
+        new_index = _list_index(new, key)
+        if new_index is None:
+            continue
+        old_index = _list_index(old, key) if old else {}
+        if old_index is None:
+            continue
+        result = []
+        for identity, item in old_index.items():
+            change = new_index.get(identity)
+            if change is None:
+                result.append(item)
+            elif _absent(change):
+                continue
+            elif change == item:
+                result.append(item)
+            else:
+                child = {}
+                stack.append((child, item, change))
+                result.append(child)
+        for identity, item in new_index.items():
+            if identity not in old_index and not _absent(item):
+                result.append(item)
+        return result
+    return new
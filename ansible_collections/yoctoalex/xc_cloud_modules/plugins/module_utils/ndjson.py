@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+#
+# GNU General Public License v3.0 (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import gzip
+import io
+import json
+import os
+import tempfile
+
+
+def open_text(path, mode='r', compress=None):
+    """Open ``path`` as UTF-8 text, gzip compressed if ``compress`` is True
+    or (when ``compress`` is None) if the name ends with ``.gz``."""
+    if compress is None:
+        compress = path.endswith('.gz')
+    if compress:
+        return io.TextIOWrapper(gzip.open(path, mode.replace('t', '') + 'b'), encoding='utf-8')
+    return io.open(path, mode, encoding='utf-8')
+
+
+def read_records(path):
+    """Yield the objects of a newline-delimited JSON file one line at a time."""
+    with open_text(path, 'r') as f:
+        for number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError as ex:
+                raise ValueError("{0}:{1}: {2}".format(path, number, ex))
+
+
+class RecordWriter(object):
+    """Writes objects to a newline-delimited JSON file.
+
+    Records go to a temporary file of its own next to ``path`` which
+    replaces ``path`` on ``close()``, so an interrupted export never leaves a
+    truncated file behind and concurrent exports to the same ``path`` do not
+    write into each other. ``abort()`` drops the temporary file instead.
+    ``bytes`` counts the UTF-8 encoded records, before compression.
+    """
+    def __init__(self, path, compress=None):
+        self.path = path
+        fd, self.tmp = tempfile.mkstemp(dir=os.path.dirname(path) or '.', prefix='.' + os.path.basename(path))
+        os.close(fd)
+        self.compress = path.endswith('.gz') if compress is None else compress
+        try:
+            self.file = open_text(self.tmp, 'w', self.compress)
+        except Exception:
+            os.remove(self.tmp)
+            raise
+        self.records = 0
+        self.bytes = 0
+
+    def write(self, record):
+        line = json.dumps(record, sort_keys=True, separators=(',', ':')) + '\n'
+        self.file.write(line)
+        self.records += 1
+        self.bytes += len(line.encode('utf-8'))
+
+    def close(self):
+        self.file.close()
+        os.replace(self.tmp, self.path)
+
+    def abort(self):
+        self.file.close()
+        os.remove(self.tmp)
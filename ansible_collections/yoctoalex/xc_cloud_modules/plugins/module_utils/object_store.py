@@ -0,0 +1,371 @@
+# -*- coding: utf-8 -*-
+#
+# GNU General Public License v3.0 (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import base64
+import binascii
+import codecs
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+
+from ..module_utils.common import F5ModuleError
+
+STORED_OBJECTS_URI = '/api/object_store/namespaces/{namespace}/stored_objects'
+
+CHUNK_SIZE = 256 * 1024
+
+CONTENT_FIELDS = ('string_value', 'bytes_value')
+
+OBJECT_URL = re.compile(r'/namespaces/([^/]+)/stored_objects/([^/]+)/([^/?#]+)(?:/([^/?#]+))?')
+
+_STRUCTURE = re.compile(br'["{}\[\]:,]')
+_HIGH_SURROGATE = re.compile(br'\\u[dD][89abAB][0-9a-fA-F]{2}')
+
+
+def object_uri(namespace, object_type, name, version=None):
+    uri = '{0}/{1}/{2}'.format(STORED_OBJECTS_URI.format(namespace=namespace), object_type, name)
+    if version:
+        uri = '{0}/{1}'.format(uri, version)
+    return uri
+
+
+def parse_object_url(url):
+    """``(namespace, object_type, name, version)`` of a stored object URL, version None when absent."""
+    match = OBJECT_URL.search(url or '')
+    if not match:
+        return None
+    return match.groups()
+
+
+def content_digest(string_value=None, bytes_value=None):
+    """sha256 of the content of a stored object.
+
+    ``bytes_value`` is base64 as on the wire and is hashed decoded, so the
+    digest of the same content does not depend on how it was encoded.
+    Returns None when there is no content.
+    """
+    if string_value is not None:
+        data = string_value.encode('utf-8')
+    elif bytes_value is not None:
+        try:
+            data = base64.b64decode(bytes_value)
+        except (TypeError, ValueError, binascii.Error):
+            data = bytes_value.encode('utf-8')
+    else:
+        return None
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_digest(path):
+    """sha256 of a file, read in chunks; equals ``content_digest`` of its content."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def text_chunks(path):
+    """Content of a UTF-8 file as JSON string escaped chunks, without the quotes."""
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            yield json.dumps(decoder.decode(chunk))[1:-1].encode('ascii')
+    decoder.decode(b'', final=True)
+
+
+def base64_chunks(path):
+    """Content of a file base64 encoded, in chunks that concatenate to one encoding."""
+    # Whole groups of 3 bytes encode without padding, so only the last
+    # chunk can end in "=".
+    size = CHUNK_SIZE - CHUNK_SIZE % 3
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(size), b''):
+            yield base64.b64encode(chunk)
+
+
+def base64_length(path):
+    return 4 * ((os.path.getsize(path) + 2) // 3)
+
+
+def gzip_file(src, dest):
+    """Gzip ``src`` into ``dest`` in chunks, reproducibly (no name or mtime)."""
+    with open(src, 'rb') as source:
+        with open(dest, 'wb') as target:
+            with gzip.GzipFile(filename='', mode='wb', fileobj=target, mtime=0) as compressed:
+                shutil.copyfileobj(source, compressed, CHUNK_SIZE)
+
+
+class StreamedBody(object):
+    """JSON request body with one string field streamed from a file.
+
+    ``fields`` are the other members of the object. Iterating yields the
+    body in chunks produced by ``encode(path)``, so the file is never held
+    in memory as a whole, and ``len()`` gives the Content-Length, taken from
+    ``length`` or, when that is not known up front, from one extra pass.
+    """
+    def __init__(self, fields, name, path, encode=text_chunks, length=None):
+        head = json.dumps(fields, separators=(',', ':'))[:-1]
+        if fields:
+            head += ','
+        self.head = (head + json.dumps(name) + ':"').encode('utf-8')
+        self.tail = b'"}'
+        self.path = path
+        self.encode = encode
+        self.length = length
+
+    def __iter__(self):
+        yield self.head
+        for chunk in self.encode(self.path):
+            yield chunk
+        yield self.tail
+
+    def __len__(self):
+        if self.length is None:
+            self.length = sum(len(chunk) for chunk in self.encode(self.path))
+        return len(self.head) + self.length + len(self.tail)
+
+    @property
+    def headers(self):
+        return {'Content-Type': 'application/json', 'Content-Length': str(len(self))}
+
+
+def _string_end(buf, pos):
+    """Index of the quote ending the JSON string that continues at ``pos``, or -1."""
+    end = buf.find(b'"', pos)
+    while end != -1:
+        if _backslashes(buf, pos, end) % 2 == 0:
+            return end
+        end = buf.find(b'"', end + 1)
+    return -1
+
+
+def _backslashes(buf, pos, index):
+    """Number of backslashes right before ``index``, not looking before ``pos``."""
+    start = index
+    while start > pos and buf[start - 1:start] == b'\\':
+        start -= 1
+    return index - start
+
+
+def _whole_escapes(buf, pos):
+    """End of the part of an unfinished JSON string from ``pos`` that does not cut an escape."""
+    cut = len(buf)
+    last = buf.rfind(b'\\', pos)
+    if last != -1 and _backslashes(buf, pos, last) % 2 == 0:
+        escape = buf[last:last + 6]
+        if len(escape) < 2 or escape[1:2] == b'u' and len(escape) < 6:
+            cut = last
+    # A high surrogate is kept back too, its low half may follow.
+    if cut - 6 >= pos and _HIGH_SURROGATE.match(buf, cut - 6) and _backslashes(buf, pos, cut - 6) % 2 == 0:
+        cut -= 6
+    # Nor is a UTF-8 sequence cut, so that the part decodes on its own.
+    lead = cut - 1
+    while lead > max(pos, cut - 4) and 0x80 <= buf[lead] < 0xc0:
+        lead -= 1
+    if lead >= pos and buf[lead] >= 0xc0:
+        length = 2 if buf[lead] < 0xe0 else 3 if buf[lead] < 0xf0 else 4
+        if lead + length > cut:
+            cut = lead
+    return cut
+
+
+def _unescape(data):
+    if b'\\' not in data:
+        return data
+    return json.loads(b'"' + data + b'"').encode('utf-8', 'surrogatepass')
+
+
+def json_string_members(chunks, names):
+    """Top-level string members ``names`` of a JSON object read in ``chunks``.
+
+    Yields ``(name, data)`` pairs, ``data`` being a piece of the unescaped
+    UTF-8 value, so a large value is never held whole. Every other member is
+    skipped without being decoded.
+    """
+    names = set(names)
+    depth = 0
+    expect_key = False
+    key = None
+    mode = None  # None between strings, else 'key', 'skip' or the member being read
+    token = b''
+    buf = b''
+    for chunk in chunks:
+        buf += chunk
+        pos = 0
+        while pos < len(buf):
+            if mode is None:
+                match = _STRUCTURE.search(buf, pos)
+                if not match:
+                    pos = len(buf)
+                    break
+                char = match.group()
+                pos = match.end()
+                if char == b'"':
+                    if depth == 1 and expect_key:
+                        mode, token = 'key', b''
+                    elif depth == 1 and key in names:
+                        mode = key
+                    else:
+                        mode = 'skip'
+                elif char in b'{[':
+                    depth += 1
+                    expect_key = depth == 1 and char == b'{'
+                elif char in b'}]':
+                    depth -= 1
+                elif char == b':' and depth == 1:
+                    expect_key = False
+                elif char == b',' and depth == 1:
+                    expect_key, key = True, None
+                continue
+
+            end = _string_end(buf, pos)
+            cut = end if end != -1 else _whole_escapes(buf, pos)
+            if mode == 'key':
+                token += buf[pos:cut]
+            elif mode != 'skip' and cut > pos:
+                yield mode, _unescape(buf[pos:cut])
+            if end == -1:
+                pos = cut
+                break
+            if mode == 'key':
+                key = json.loads(b'"' + token + b'"')
+            mode = None
+            pos = end + 1
+        buf = buf[pos:]
+
+
+def content_chunks(members):
+    """Content of a stored object from the ``CONTENT_FIELDS`` pieces of ``json_string_members``."""
+    pending = b''
+    for name, data in members:
+        if name == 'string_value':
+            yield data
+            continue
+        pending += b''.join(data.split())
+        cut = len(pending) - len(pending) % 4
+        if cut:
+            yield base64.b64decode(pending[:cut])
+            pending = pending[cut:]
+    if pending:
+        yield base64.b64decode(pending)
+
+
+def save_content(response, f):
+    """Write the content of a stored object GET sent with ``stream=True`` to ``f``.
+
+    The body is read and decoded in chunks. Returns the sha256 of the content.
+    """
+    digest = hashlib.sha256()
+    for data in content_chunks(json_string_members(response.iter_content(CHUNK_SIZE), CONTENT_FIELDS)):
+        digest.update(data)
+        f.write(data)
+    return digest.hexdigest()
+
+
+def put_file(client, namespace, object_type, name, path, fields=None, field='string_value', encode=text_chunks,
+             length=None):
+    """Upload ``path`` as a new version of a stored object, streamed; returns the response.
+
+    ``fields`` are other members of the request, such as ``content_format``.
+    ``field``, ``encode`` and ``length`` are as for StreamedBody.
+    """
+    fields = dict(fields or {}, name=name, namespace=namespace, object_type=object_type)
+    body = StreamedBody(fields, field, path, encode=encode, length=length)
+    try:
+        response = client.api.put(url=object_uri(namespace, object_type, name), data=body, headers=body.headers)
+    except UnicodeDecodeError:
+        raise F5ModuleError("{0} is not a UTF-8 text file".format(path))
+    if response.status not in [200, 201, 202]:
+        raise F5ModuleError(response.content)
+    return response
+
+
+def stored_digest(client, namespace, object_type, name, version=None):
+    """sha256 of the content of a stored object, read in chunks; None if there is no such object."""
+    stored = stored_fields(client, namespace, object_type, name, version=version)
+    return stored[0] if stored is not None else None
+
+
+def stored_fields(client, namespace, object_type, name, fields=(), version=None):
+    """``(sha256, values)`` of a stored object, read in chunks; None if there is no such object.
+
+    ``values`` maps each of ``fields``, other top-level string members of
+    the object such as ``content_format``, to its value or None.
+    """
+    response = client.api.get(url=object_uri(namespace, object_type, name, version), stream=True)
+    if response.status == 404:
+        return None
+    if response.status not in [200, 201, 202]:
+        raise F5ModuleError(response.content)
+    pieces = {}
+
+    def content(members):
+        for member, piece in members:
+            if member in CONTENT_FIELDS:
+                yield member, piece
+            else:
+                pieces[member] = pieces.get(member, b'') + piece
+
+    digest = hashlib.sha256()
+    members = json_string_members(response.iter_content(CHUNK_SIZE), CONTENT_FIELDS + tuple(fields))
+    for data in content_chunks(content(members)):
+        digest.update(data)
+    values = dict((field, pieces[field].decode('utf-8') if field in pieces else None) for field in fields)
+    return digest.hexdigest(), values
+
+
+def list_stored_objects(client, namespace, object_type=None, name=None, latest_only=False):
+    """Stored objects of ``namespace`` with their versions, as returned by the list API."""
+    query = []
+    if object_type:
+        query.append('object_type={0}'.format(object_type))
+    if name:
+        query.append('name={0}'.format(name))
+    if latest_only:
+        query.append('latest_version_only=true')
+    url = STORED_OBJECTS_URI.format(namespace=namespace)
+    if query:
+        url = '{0}?{1}'.format(url, '&'.join(query))
+    response = client.api.get(url=url)
+    if response.status == 404:
+        return []
+    if response.status not in [200, 201, 202]:
+        raise F5ModuleError(response.content)
+    return response.json().get('items') or []
+
+
+def latest_urls(client, namespace, object_type):
+    """URL of the latest version of every stored object of ``object_type``, by name."""
+    result = {}
+    for item in list_stored_objects(client, namespace, object_type, latest_only=True):
+        versions = item.get('versions') or []
+        latest = [version for version in versions if version.get('latest_version')] or versions[:1]
+        if latest:
+            result[item.get('name')] = latest[0].get('url')
+    return result
+
+
+def latest_descriptor(client, namespace, object_type, name):
+    """``metadata`` of the latest version of a stored object, as a PUT returns it."""
+    for item in list_stored_objects(client, namespace, object_type, name, latest_only=True):
+        if item.get('name') != name:
+            continue
+        versions = item.get('versions') or []
+        latest = [version for version in versions if version.get('latest_version')] or versions[:1]
+        if latest:
+            return dict(
+                name=name,
+                namespace=namespace,
+                url=latest[0].get('url'),
+                version=latest[0].get('version'),
+                creation_timestamp=latest[0].get('creation_timestamp'),
+            )
+    return None
@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+#
+# GNU General Public License v3.0 (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import time
+
+from ..module_utils.client import XcRestClient
+from ..module_utils.common import (
+    F5ModuleError, AnsibleF5Parameters, f5_argument_spec
+)
+from ..module_utils.constants import PATCH_LIST_KEYS
+from ..module_utils.merge import merge_dicts
+
+
+class ConfigKind(object):
+    """Describes how the API addresses one kind of ``metadata``/``spec`` object.
+
+    ``collection_uri`` and ``item_uri`` are templates formatted with the
+    object's ``namespace`` and ``name``; the collection also lists objects.
+    ``delete_uri``/``delete_method`` override how the object is removed.
+    ``namespaced`` is False for kinds that live at tenant level, ``replace``
+    is False for kinds that are never updated once created, and ``wait``
+    names kinds whose creation is finished only when
+    ``system_metadata.initializers.pending`` is empty. ``defaults`` fills in
+    ``spec`` values the object does not state on create and replace.
+
+    ``list_keys`` maps a name reported in ``list_changes`` to the path of a
+    list in the object and the identity function used to merge it.
+
+    ``references`` lists ``(path, kind)`` pairs locating references to other
+    objects (see ``graph.references``), which order objects when several are
+    applied or removed together.
+
+    Instances are normally looked up in the ``kinds`` registry.
+    """
+    def __init__(self, kind, collection_uri, item_uri, delete_uri=None, delete_method='DELETE',
+                 namespaced=True, replace=True, wait=False, defaults=None, list_keys=None, references=()):
+        self.kind = kind
+        self.collection_uri = collection_uri
+        self.item_uri = item_uri
+        self.delete_uri = delete_uri or item_uri
+        self.delete_method = delete_method
+        self.namespaced = namespaced
+        self.replace = replace
+        self.wait = wait
+        self.defaults = defaults or {}
+        self.list_keys = list_keys or {}
+        self.patch_list_keys = PATCH_LIST_KEYS + tuple(key for path, key in self.list_keys.values())
+        self.references = tuple(references)
+
+    def collection(self, metadata):
+        return self.collection_uri.format(namespace=metadata.get('namespace'), name=metadata.get('name'))
+
+    def item(self, metadata):
+        return self.item_uri.format(namespace=metadata.get('namespace'), name=metadata.get('name'))
+
+    def delete(self, metadata):
+        return self.delete_uri.format(namespace=metadata.get('namespace'), name=metadata.get('name'))
+
+
+class Parameters(AnsibleF5Parameters):
+    updatables = ['metadata', 'spec']
+
+    returnables = ['metadata', 'spec', 'system_metadata', 'status']
+
+
+class ModuleParameters(Parameters):
+    pass
+
+
+class ApiParameters(Parameters):
+    pass
+
+
+class Changes(Parameters):
+    pass
+
+
+class ConfigObjectManager(object):
+    """Creates, replaces, removes or reads one object of ``kind``.
+
+    Modules that report ``list_changes`` pass ``list_diff`` (normally
+    ``diff.diff_lists``); it is applied to the ``list_keys`` of the kind on
+    update. Other modules leave it out and do not ship the diff code.
+    """
+    def __init__(self, *args, **kwargs):
+        self.module = kwargs.get('module', None)
+        self.kind = kwargs.get('kind', None)
+        self.list_diff = kwargs.get('list_diff', None)
+        params = kwargs.get('params', None) or self.module.params
+        self.client = kwargs.get('client', None) or XcRestClient(**params)
+
+        self.want = ModuleParameters(params=params)
+        self.have = ApiParameters()
+        self.list_changes = None
+
+        if self.kind.namespaced and not (self.want.metadata or {}).get('namespace'):
+            raise F5ModuleError("metadata.namespace is required for {0} objects".format(self.kind.kind))
+
+    def exec_module(self):
+        changed = False
+        result = dict()
+        state = self.want.state
+
+        if state == 'present':
+            changed = self.present()
+        elif state == 'absent':
+            changed = self.absent()
+        elif state == 'fetch':
+            self.exists()
+
+        changes = self.have.to_return()
+        result.update(**changes)
+        if self.list_changes is not None:
+            result.update(list_changes=self.list_changes)
+        result.update(dict(changed=changed))
+        return result
+
+    def present(self):
+        if self.exists():
+            if not self.kind.replace:
+                return False
+            return self.update()
+        else:
+            return self.create()
+
+    def absent(self):
+        if self.exists():
+            return self.remove()
+        return False
+
+    def remove(self):
+        send = getattr(self.client.api, self.kind.delete_method.lower())
+        response = send(url=self.kind.delete(self.want.metadata))
+        if response.status == 404:
+            return False
+        if response.status not in [200, 201, 202]:
+            raise F5ModuleError(response.content)
+        return True
+
+    def exists(self):
+        response = self.client.api.get(url=self.kind.item(self.want.metadata))
+        if response.status == 404:
+            return False
+        if response.status not in [200, 201, 202]:
+            raise F5ModuleError(response.content)
+        if response.json().get('metadata', None):
+            self.have = ApiParameters(params=response.json())
+            return True
+        return False
+
+    def with_defaults(self, params):
+        if self.kind.defaults:
+            spec = dict(self.kind.defaults)
+            spec.update(params.get('spec') or {})
+            params['spec'] = spec
+        return params
+
+    def create(self):
+        to_create = self.with_defaults(self.want.to_update())
+        response = self.client.api.post(url=self.kind.collection(self.want.metadata), json=to_create)
+        if response.status not in [200, 201, 202]:
+            raise F5ModuleError(response.content)
+
+        result = response.json()
+        if self.kind.wait and self.want.wait:
+            result = self.wait_ready()
+
+        self.have = ApiParameters(params=result)
+        return True
+
+    def wait_ready(self):
+        for retry in range(0, 100):
+            response = self.client.api.get(url=self.kind.item(self.want.metadata))
+            if response.status not in [200, 201, 202]:
+                raise F5ModuleError(response.content)
+            result = response.json()
+            initializers = result.get('system_metadata', {}).get('initializers')
+            if initializers and len(initializers.get('pending') or []) == 0:
+                break
+            time.sleep(15)
+        return result
+
+    def update(self):
+        have = self.have.to_update()
+        if self.want.patch:
+            list_keys = self.kind.patch_list_keys if self.want.list_merge == 'merge' else ()
+            to_update = merge_dicts(have, self.want.to_update(), list_keys=list_keys)
+        else:
+            to_update = self.with_defaults(self.want.to_update())
+        if self.list_diff is not None and self.kind.list_keys:
+            self.list_changes = dict(
+                (name, self.list_diff(_lookup(have, path), _lookup(to_update, path), key=key))
+                for name, (path, key) in self.kind.list_keys.items()
+            )
+        response = self.client.api.put(url=self.kind.item(self.want.metadata), json=to_update)
+        if response.status not in [200, 201, 202]:
+            raise F5ModuleError(response.content)
+        # The replace API usually answers with an empty body, in which case
+        # the stored object (with defaults and system_metadata) is read back.
+        if response.content and response.json().get('metadata', None):
+            self.have = ApiParameters(params=response.json())
+        elif not self.exists():
+            raise F5ModuleError("{0} {1} was removed while it was being updated".format(
+                self.kind.kind, self.want.metadata.get('name')
+            ))
+        return True
+
+
+def _lookup(params, path):
+    for part in path:
+        params = (params or {}).get(part)
+    return params
+
+
+def config_object_argument_spec(spec, namespaced=True, patch=True, wait=False):
+    """Argument spec shared by the ``metadata``/``spec`` object modules."""
+    metadata = dict(
+        type='dict',
+        name=dict(required=True),
+        labels=dict(type=dict),
+        annotations=dict(type=dict),
+        description=dict(type="str"),
+        disable=dict(type='bool')
+    )
+    if namespaced:
+        metadata.update(namespace=dict(required=True))
+    argument_spec = dict(
+        state=dict(
+            default='present',
+            choices=['present', 'absent', 'fetch']
+        ),
+        metadata=metadata,
+        spec=spec,
+    )
+    if patch:
+        argument_spec.update(
+            patch=dict(type='bool', default=False),
+            list_merge=dict(type='str', default='replace', choices=['merge', 'replace']),
+        )
+    if wait:
+        argument_spec.update(wait=dict(type='bool', default=False))
+
+    result = {}
+    result.update(f5_argument_spec)
+    result.update(argument_spec)
+    return result
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+#
+# GNU General Public License v3.0 (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+
+from ..module_utils.diff import canonical
+
+
+def _replace(path, write, opener=open):
+    """Write ``path`` through a temporary file of its own that then replaces it."""
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.' + os.path.basename(path))
+    os.close(fd)
+    try:
+        with opener(tmp, 'wb') as f:
+            write(f)
+        os.replace(tmp, path)
+    except Exception:
+        os.remove(tmp)
+        raise
+
+
+class SnapshotStore(object):
+    """Content-addressed store of objects with one manifest per snapshot.
+
+    Layout under ``path``::
+
+        objects/ab/abcdef....json.gz   canonical JSON of one object, by sha256
+        manifests/<name>.json          {"kind/namespace/name": [hash, modified]}
+        latest                         name of the newest manifest
+
+    An object is written once however many snapshots contain it, so a new
+    snapshot costs one manifest plus the objects that changed.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.objects = os.path.join(path, 'objects')
+        self.manifests = os.path.join(path, 'manifests')
+        for directory in (self.objects, self.manifests):
+            if not os.path.isdir(directory):
+                os.makedirs(directory)
+
+    @staticmethod
+    def entry_key(key):
+        return '/'.join(key)
+
+    def blob_path(self, digest):
+        return os.path.join(self.objects, digest[:2], digest + '.json.gz')
+
+    def put(self, record):
+        """Store ``record`` unless already present; returns ``(hash, written)``."""
+        data = canonical(record).encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.blob_path(digest)
+        if os.path.exists(path):
+            return digest, False
+        directory = os.path.dirname(path)
+        if not os.path.isdir(directory):
+            os.makedirs(directory, exist_ok=True)
+        _replace(path, lambda f: f.write(data), lambda name, mode: gzip.open(name, mode, compresslevel=6))
+        return digest, True
+
+    def get(self, digest):
+        with gzip.open(self.blob_path(digest), 'rb') as f:
+            return json.loads(f.read().decode('utf-8'))
+
+    def latest(self):
+        try:
+            with open(os.path.join(self.path, 'latest')) as f:
+                return f.read().strip() or None
+        except IOError:
+            return None
+
+    def load_manifest(self, name):
+        with open(os.path.join(self.manifests, name + '.json')) as f:
+            return json.load(f)
+
+    def save_manifest(self, name, entries):
+        data = json.dumps(entries, sort_keys=True, separators=(',', ':')).encode('utf-8')
+        _replace(os.path.join(self.manifests, name + '.json'), lambda f: f.write(data))
+        _replace(os.path.join(self.path, 'latest'), lambda f: f.write(name.encode('utf-8')))
@@ -25,6 +25,20 @@ options:
           - absent
           - fetch
         default: present
+    cache:
+        type: path
+        description:
+            - File to keep issued credentials in, readable by its owner only.
+            - With C(state=present), a credential issued earlier for the same C(api_type), virtual K8s cluster,
+              namespace, C(expiration_days) and C(password) is returned from the cache while it is valid for more
+              than C(renew_before) seconds, instead of issuing a new one. The password is kept as a hash.
+            - Credentials revoked with C(state=absent) are removed from the cache.
+    renew_before:
+        type: int
+        default: 3600
+        description:
+            - Seconds before its expiration from which a cached credential is no longer returned
+              and a new one is issued.
     expiration_days:
         type: int
         description:
@@ -87,6 +101,7 @@ EXAMPLES = r'''
           api_type: "KUBE_CONFIG"
           virtual_k8s_name: "vk8s"
           virtual_k8s_namespace: "default"
+        cache: "~/.xc/credentials.json"
       register: credentials
 '''
 
@@ -103,34 +118,32 @@ name:
     description:
         - Name of API credential record. It will be saved in metadata.
     type: str
+expiration_timestamp:
+    description:
+        - When the credential expires.
+    type: str
+cached:
+    description:
+        - Whether the credential was taken from C(cache) rather than issued.
+    returned: when C(cache) is set
+    type: bool
 '''
 
+import time
+
 from ansible.module_utils.basic import AnsibleModule
 
 from ..module_utils.client import XcRestClient
 from ..module_utils.common import (
     F5ModuleError, AnsibleF5Parameters, f5_argument_spec
 )
+from ..module_utils.credentials import CredentialCache, parse_timestamp
 
 
 class Parameters(AnsibleF5Parameters):
     updatables = ['expiration_days', 'name', 'namespace', 'spec']
 
-    returnables = ['data', 'name']
-
-    def to_return(self):
-        result = {}
-        for returnable in self.returnables:
-            result[returnable] = getattr(self, returnable)
-        result = self._filter_params(result)
-        return result
-
-    def to_update(self):
-        result = {}
-        for updatebale in self.updatables:
-            result[updatebale] = getattr(self, updatebale)
-        result = self._filter_params(result)
-        return result
+    returnables = ['data', 'name', 'expiration_timestamp']
 
 
 class ModuleParameters(Parameters):
@@ -165,27 +178,13 @@ class ApiParameters(Parameters):
     def name(self):
         return self._values['name']
 
+    @property
+    def expiration_timestamp(self):
+        return self._values['expiration_timestamp']
 
-class Changes(Parameters):
-    def to_return(self):
-        result = {}
-        try:
-            for returnable in self.returnables:
-                result[returnable] = getattr(self, returnable)
-            result = self._filter_params(result)
-        except Exception:
-            raise
-        return result
 
-    def to_update(self):
-        result = {}
-        try:
-            for updatebale in self.updatables:
-                result[updatebale] = getattr(self, updatebale)
-            result = self._filter_params(result)
-        except Exception:
-            raise
-        return result
+class Changes(Parameters):
+    pass
 
 
 class ModuleManager(object):
@@ -195,6 +194,16 @@ class ModuleManager(object):
 
         self.want = ModuleParameters(params=self.module.params)
         self.have = ApiParameters()
+        self.cache = CredentialCache(self.want.cache) if self.want.cache else None
+        self.cached = False
+
+    def cache_key(self):
+        spec = self.want.spec
+        return CredentialCache.key(
+            self.client.tenant, self.want.namespace,
+            spec['type'], spec['virtual_k8s_namespace'], spec['virtual_k8s_name'],
+            self.want.expiration_days, CredentialCache.secret(spec['password']),
+        )
 
     def exec_module(self):
         changed = False
@@ -211,15 +220,27 @@ class ModuleManager(object):
         changes = self.have.to_return()
         result.update(**changes)
         result.update(dict(changed=changed))
+        if self.cache is not None:
+            result.update(cached=self.cached)
         return result
 
     def present(self):
+        if self.cache is not None:
+            entry = self.cache.get(self.cache_key(), self.want.renew_before)
+            if entry is not None:
+                self.have = ApiParameters(params=dict(
+                    name=entry['name'], data=entry['data'], expiration_timestamp=entry.get('expiration_timestamp')
+                ))
+                self.cached = True
+                return False
         if self.exists():
             return False
         else:
             return self.create()
 
     def absent(self):
+        if self.cache is not None and self.cache.discard(self.want.name):
+            self.cache.save()
         if self.exists():
             return self.remove()
         return False
@@ -251,8 +272,28 @@ class ModuleManager(object):
         if response.status not in [200, 201, 202]:
             raise F5ModuleError(response.content)
         self.have = ApiParameters(params=response.json())
+        if self.cache is not None:
+            self.remember()
         return True
 
+    def remember(self):
+        expires = parse_timestamp(self.have.expiration_timestamp)
+        if expires is None and self.want.expiration_days:
+            expires = time.time() + self.want.expiration_days * 86400
+        if expires is None:
+            return
+        self.cache.put(self.cache_key(), dict(
+            name=self.have.name,
+            data=self.have.data,
+            expiration_timestamp=self.have.expiration_timestamp,
+            expires=expires,
+        ))
+        try:
+            self.cache.save()
+        except F5ModuleError as ex:
+            # The credential exists now; failing would lose it for good.
+            self.module.warn(str(ex))
+
 
 class ArgumentSpec(object):
     def __init__(self):
@@ -263,6 +304,8 @@ class ArgumentSpec(object):
                 default='present',
                 choices=['present', 'absent', 'fetch']
             ),
+            cache=dict(type='path'),
+            renew_before=dict(type='int', default=3600),
             expiration_days=dict(type='int'),
             name=dict(type='str'),
             namespace=dict(type='str', default='system'),
@@ -18,58 +18,27 @@ description:
       http_loadbalancer can refer api_definition object and create access policy rules based on its api-groups.
 version_added: "0.0.1"
 options:
-    metadata:
-        annotations:
-            description:
-                - Annotations is an unstructured key value map stored with a resource
-                  that may be set by external tools to store and retrieve arbitrary metadata.
-                  They are not queryable and should be preserved when modifying objects.
-            type: object
-        description:
-            description:
-                - Human readable description for the object
-            type: str
-        disable:
-            description:
-                - A value of true will administratively disable the object
-            type: bool
-        labels:
-            description:
-                - Map of string keys and values that can be used to organize and categorize (scope and select)
-                  objects as chosen by the user. Values specified here will be used by selector expression
-            type: object
-        name:
-            type: str
-            required: True
-            description:
-                - This is the name of configuration object. It has to be unique within the namespace.
-                  It can only be specified during create API and cannot be changed during replace API.
-                  The value of name has to follow DNS-1035 format.
-        namespace:
-            description:
-                - This defines the workspace within which each the configuration object is to be created.
-                  Must be a DNS_LABEL format
-            type: str
-    state:
-        description:
-            - When C(state) is C(present), ensures the object is created or modified.
-            - When C(state) is C(absent), ensures the object is removed.
-            - When C(state) is C(fetch), returns the object.
-        type: str
-        choices:
-          - present
-          - absent
-          - fetch
-        default: present
     spec:
         swagger_specs:
             description: Define your application API by single or multiple swagger files.
             type: [str]
             required: True
-    patch:
-        type: bool
-        description: Merge changes with existing on cloud when True
-        default: False
+    swagger_files:
+        description:
+            - Local OpenAPI files to add to C(spec.swagger_specs), after the URLs given there.
+            - Each file is uploaded as a stored object of type C(swagger) in the namespace of the definition,
+              named after the file without its extension, unless the latest version already holds the same
+              content. The files are handled concurrently and the definition refers to the resulting versions.
+        type: list
+        elements: path
+    parallelism:
+        description:
+            - Maximum number of files uploaded at the same time, and of open connections.
+        type: int
+        default: 8
+extends_documentation_fragment:
+  - yoctoalex.xc_cloud_modules.config_object
+  - yoctoalex.xc_cloud_modules.config_object.patch
 '''
 
 EXAMPLES = r'''
@@ -95,6 +64,16 @@ EXAMPLES = r'''
           swagger_specs:
             - "{{ swagger_file.metadata.url }}" # see stored_object.yaml
       register: api_definition
+
+    - name: create api definition from local files
+      api_definition:
+        state: present
+        metadata:
+          namespace: "default"
+          name: "demo-api-def"
+        swagger_files:
+          - "../specs/pets.json"
+          - "../specs/orders.yaml"
 '''
 
 RETURN = r'''
@@ -139,202 +118,114 @@ spec:
     api_groups:
         description: List of api_groups belonging to this api_definition.
         type: Array of objects (ApiGroupSummary)
+swagger_files:
+    description:
+        - The stored object each of C(swagger_files) resolved to.
+    returned: when C(swagger_files) is set
+    type: list
+    elements: dict
+    contains:
+        path:
+            description: Path of the file.
+            type: str
+        name:
+            description: Name of the stored object.
+            type: str
+        url:
+            description: URL of the version the definition refers to.
+            type: str
+        changed:
+            description: Whether a new version was uploaded.
+            type: bool
 '''
 
+import os
+
 from ansible.module_utils.basic import AnsibleModule
 
 from ..module_utils.client import XcRestClient
-from ..module_utils.common import (
-    F5ModuleError, AnsibleF5Parameters, f5_argument_spec
-)
+from ..module_utils.common import F5ModuleError
+from ..module_utils.concurrency import run_parallel
+from ..module_utils.diff import changed_paths
+from ..module_utils.kinds import KINDS
+from ..module_utils.object_store import file_digest, latest_urls, put_file, stored_digest
+from ..module_utils.resource import ConfigObjectManager, config_object_argument_spec
 
+CONTENT_FORMATS = {'.json': 'json', '.yaml': 'yaml', '.yml': 'yaml'}
 
-class Parameters(AnsibleF5Parameters):
-    updatables = ['metadata', 'spec']
 
-    returnables = ['metadata', 'spec']
+def stated(value):
+    """``value`` without the options left unset."""
+    if isinstance(value, dict):
+        return dict((k, stated(v)) for k, v in value.items() if v is not None)
+    return value
 
-    def to_return(self):
-        result = {}
-        for returnable in self.returnables:
-            result[returnable] = getattr(self, returnable)
-        result = self._filter_params(result)
-        return result
-
-    def to_update(self):
-        result = {}
-        for updatebale in self.updatables:
-            result[updatebale] = getattr(self, updatebale)
-        result = self._filter_params(result)
-        return result
 
-
-class ModuleParameters(Parameters):
-    @property
-    def metadata(self):
-        return self._values['metadata']
-
-    @property
-    def spec(self):
-        return self._values['spec']
-
-
-class ApiParameters(Parameters):
-    @property
-    def metadata(self):
-        return self._values['metadata']
-
-    @property
-    def spec(self):
-        return self._values['spec']
-
-
-class Changes(Parameters):
-    def to_return(self):
-        result = {}
-        try:
-            for returnable in self.returnables:
-                result[returnable] = getattr(self, returnable)
-            result = self._filter_params(result)
-        except Exception:
-            raise
-        return result
-
-    def to_update(self):
-        result = {}
-        try:
-            for updatebale in self.updatables:
-                result[updatebale] = getattr(self, updatebale)
-            result = self._filter_params(result)
-        except Exception:
-            raise
-        return result
-
-
-class ModuleManager(object):
+class ModuleManager(ConfigObjectManager):
     def __init__(self, *args, **kwargs):
-        self.module = kwargs.get('module', None)
-        self.client = XcRestClient(**self.module.params)
-
-        self.want = ModuleParameters(params=self.module.params)
-        self.have = ApiParameters()
-
-    def _merge_dicts(self, dict1, dict2):
-        for k in set(dict1.keys()).union(dict2.keys()):
-            if k in dict1 and k in dict2:
-                if isinstance(dict1[k], dict) and isinstance(dict2[k], dict):
-                    yield k, dict(self._merge_dicts(dict1[k], dict2[k]))
-                elif dict2[k] is None:
-                    pass
-                else:
-                    yield k, dict2[k]
-            elif k in dict1:
-                if dict1[k] is None:
-                    pass
-                else:
-                    yield k, dict1[k]
-            else:
-                if dict2[k] is None:
-                    pass
-                else:
-                    yield k, dict2[k]
+        params = kwargs['module'].params
+        # Uploads and the definition itself share one pool of connections.
+        kwargs.setdefault('client', XcRestClient(provider=params['provider'], pool_size=params['parallelism']))
+        super(ModuleManager, self).__init__(*args, **kwargs)
+        self.swagger_files = None
 
     def exec_module(self):
-        changed = False
-        result = dict()
-        state = self.want.state
-
-        if state == 'present':
-            changed = self.present()
-        elif state == 'absent':
-            changed = self.absent()
-        elif state == 'fetch':
-            self.exists()
-
-        changes = self.have.to_return()
-        result.update(**changes)
-        result.update(dict(changed=changed))
+        result = super(ModuleManager, self).exec_module()
+        if self.swagger_files is not None:
+            result.update(swagger_files=self.swagger_files)
         return result
 
     def present(self):
-        if self.exists():
-            return self.update()
-        else:
+        if self.want.swagger_files:
+            self.upload_swagger_files()
+        if not self.exists():
             return self.create()
-
-    def absent(self):
-        if self.exists():
-            return self.remove()
-        return False
-
-    def remove(self):
-        uri = f"/api/config/namespaces/{self.want.metadata['namespace']}/api_definitions/{self.want.metadata['name']}"
-        response = self.client.api.delete(url=uri)
-        if response.status == 404:
+        if not changed_paths(self.have.to_update(), stated(self.want.to_update())):
             return False
-        if response.status not in [200, 201, 202]:
-            raise F5ModuleError(response.content)
-
-    def exists(self):
-        uri = f"/api/config/namespaces/{self.want.metadata['namespace']}/api_definitions/{self.want.metadata['name']}"
-        response = self.client.api.get(url=uri)
-        if response.status == 404:
-            return False
-        if response.status not in [200, 201, 202]:
-            raise F5ModuleError(response.content)
-        if response.json().get('metadata', None):
-            self.have = ApiParameters(params=response.json())
-            return True
-        return False
-
-    def create(self):
-        uri = f"/api/config/namespaces/{self.want.metadata['namespace']}/api_definitions"
-        response = self.client.api.post(url=uri, json=self.want.to_update())
-        if response.status not in [200, 201, 202]:
-            raise F5ModuleError(response.content)
-        self.have = ApiParameters(params=response.json())
-        return True
-
-    def update(self):
-        if self.want.patch:
-            to_update = dict(self._merge_dicts(self.have.to_update(), self.want.to_update()))
-        else:
-            to_update = self.want.to_update()
-        uri = f"/api/config/namespaces/{self.want.metadata['namespace']}/api_definitions/{self.want.metadata['name']}"
-        response = self.client.api.put(url=uri, json=to_update)
-        if response.status not in [200, 201, 202]:
-            raise F5ModuleError(response.content)
-        self.have = ApiParameters(params=to_update)
-        return True
+        return self.update()
+
+    def upload_swagger_files(self):
+        namespace = self.want.metadata['namespace']
+        files = []
+        for path in self.want.swagger_files:
+            name = os.path.splitext(os.path.basename(path))[0]
+            if any(name == other for other, dummy in files):
+                raise F5ModuleError("More than one of swagger_files would be stored as {0}".format(name))
+            files.append((name, path))
+        latest = latest_urls(self.client, namespace, 'swagger')
+
+        def upload(entry):
+            name, path = entry
+            if name in latest and stored_digest(self.client, namespace, 'swagger', name) == file_digest(path):
+                return dict(path=path, name=name, url=latest[name], changed=False)
+            fields = dict(content_format=CONTENT_FORMATS.get(os.path.splitext(path)[1].lower()))
+            response = put_file(self.client, namespace, 'swagger', name, path, stated(fields)).json()
+            return dict(path=path, name=name, url=(response.get('metadata') or {}).get('url'), changed=True)
+
+        self.swagger_files = []
+        for result, error in run_parallel(upload, files, self.want.parallelism):
+            if error is not None:
+                raise error
+            self.swagger_files.append(result)
+        spec = dict(self.want.spec or {})
+        urls = [entry['url'] for entry in self.swagger_files]
+        spec.update(swagger_specs=list(spec.get('swagger_specs') or []) + urls)
+        self.want.update(params=dict(spec=spec))
 
 
 class ArgumentSpec(object):
     def __init__(self):
         self.supports_check_mode = False
-
-        argument_spec = dict(
-            state=dict(
-                default='present',
-                choices=['present', 'absent', 'fetch']
-            ),
-            patch=dict(type='bool', default=False),
-            metadata=dict(
-                type='dict',
-                name=dict(required=True),
-                namespace=dict(required=True),
-                labels=dict(type=dict),
-                annotations=dict(type=dict),
-                description=dict(type="str"),
-                disable=dict(type='bool')
-            ),
+        self.argument_spec = config_object_argument_spec(
             spec=dict(
                 type=dict,
                 swagger_specs=dict(type='list', elements='str'),
-            )
+            ),
+        )
+        self.argument_spec.update(
+            swagger_files=dict(type='list', elements='path'),
+            parallelism=dict(type='int', default=8),
         )
-        self.argument_spec = {}
-        self.argument_spec.update(f5_argument_spec)
-        self.argument_spec.update(argument_spec)
 
 
 def main():
@@ -345,7 +236,7 @@ def main():
         supports_check_mode=spec.supports_check_mode
     )
     try:
-        mm = ModuleManager(module=module)
+        mm = ModuleManager(module=module, kind=KINDS['api_definition'])
         results = mm.exec_module()
         module.exit_json(**results)
     except F5ModuleError as ex:
@@ -105,20 +105,6 @@ class Parameters(AnsibleF5Parameters):
         'state'
     ]
 
-    def to_return(self):
-        result = {}
-        for returnable in self.returnables:
-            result[returnable] = getattr(self, returnable)
-        result = self._filter_params(result)
-        return result
-
-    def to_update(self):
-        result = {}
-        for updatebale in self.updatables:
-            result[updatebale] = getattr(self, updatebale)
-        result = self._filter_params(result)
-        return result
-
 
 class ModuleParameters(Parameters):
     pass
@@ -163,25 +149,7 @@ class ApiParameters(Parameters):
 
 
 class Changes(Parameters):
-    def to_return(self):
-        result = {}
-        try:
-            for returnable in self.returnables:
-                result[returnable] = getattr(self, returnable)
-            result = self._filter_params(result)
-        except Exception:
-            raise
-        return result
-
-    def to_update(self):
-        result = {}
-        try:
-            for updatebale in self.updatables:
-                result[updatebale] = getattr(self, updatebale)
-            result = self._filter_params(result)
-        except Exception:
-            raise
-        return result
+    pass
 
 
 class ModuleManager(object):
@@ -192,26 +160,6 @@ class ModuleManager(object):
         self.want = ModuleParameters(params=self.module.params)
         self.have = ApiParameters()
 
-    def _merge_dicts(self, dict1, dict2):
-        for k in set(dict1.keys()).union(dict2.keys()):
-            if k in dict1 and k in dict2:
-                if isinstance(dict1[k], dict) and isinstance(dict2[k], dict):
-                    yield k, dict(self._merge_dicts(dict1[k], dict2[k]))
-                elif dict2[k] is None:
-                    pass
-                else:
-                    yield k, dict2[k]
-            elif k in dict1:
-                if dict1[k] is None:
-                    pass
-                else:
-                    yield k, dict1[k]
-            else:
-                if dict2[k] is None:
-                    pass
-                else:
-                    yield k, dict2[k]
-
     def exec_module(self):
         changed = False
         result = dict()
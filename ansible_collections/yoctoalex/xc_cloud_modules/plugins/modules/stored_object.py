@@ -18,6 +18,7 @@ options:
         description:
             - When C(state) is C(present), ensures the object is created or modified.
             - When C(state) is C(absent), ensures the object is removed.
+            - When C(state) is C(fetch), downloads the content of the object to C(dest).
         type: str
         choices:
           - present
@@ -29,6 +30,12 @@ options:
         description:
             - Exclusive with [string_value] Binary object contents. Should be encoded in base64 scheme.
         type: str
+    checksum:
+        description:
+            - sha256 the fetched content is expected to have, for example the C(sha256) returned by
+              an earlier fetch or upload. When C(dest) already has it, the download is skipped.
+            - Only used with C(state=fetch).
+        type: str
     content_format:
         description:
             - The optional content format associated with object
@@ -37,6 +44,31 @@ options:
         description:
             - The optional description associated with object
         type: str
+    dest:
+        description:
+            - File to write the content to with C(state=fetch). Binary contents are written decoded.
+            - The response is decoded and written in chunks, and C(dest) is only replaced when
+              the content differs from what it already holds.
+        type: path
+    binary:
+        description:
+            - Upload C(src) as binary contents (C(bytes_value)) instead of as a string.
+            - The file is base64 encoded in chunks while it is sent.
+        type: bool
+        default: False
+    compress:
+        description:
+            - Gzip C(src) before uploading it as binary contents. The stored object then holds the gzip data,
+              which suits large compressible formats such as JSON or text archives.
+        type: bool
+        default: False
+    force:
+        description:
+            - Upload the content even if the latest version on cloud has the same content.
+            - By default an upload is skipped when the sha256 of the content matches the latest version,
+              since every upload creates a new version.
+        type: bool
+        default: False
     mobile_sdk:
         description:
             - Describes attributes specific to object type - mobile-sdk
@@ -44,8 +76,8 @@ options:
     name:
         description:
             - Name of the stored_object.
+            - Required unless C(src) is a directory, where it is the prefix of the object names.
         type: str
-        required: True
     namespace:
         description:
             - Namespace in which object is to be created
@@ -60,10 +92,39 @@ options:
             - Type of the stored_object
         type: str
         required: True
+    parallelism:
+        description:
+            - Maximum number of files uploaded at the same time when C(src) is a directory,
+              and of open connections.
+        type: int
+        default: 8
+    patterns:
+        description:
+            - Shell patterns of the file names uploaded when C(src) is a directory.
+        type: list
+        elements: str
+        default: ['*.json', '*.yaml', '*.yml']
+    src:
+        description:
+            - Path of a UTF-8 file to upload as the string contents, instead of passing them in C(string_value).
+            - The file is read and sent in chunks, so large files do not pass through the task arguments
+              or sit in memory whole.
+            - When C(src) is a directory, every file below it matching C(patterns) is uploaded as an object of
+              C(object_type). The object name is the path of the file relative to C(src) without its extension,
+              with C(-) for the directory separators, after C(name) and C(-) when C(name) is set.
+              The namespace is listed once and only new files and files whose content differs from the latest
+              version are uploaded, concurrently.
+            - Mutually exclusive with C(string_value) and C(bytes_value).
+            - See C(binary) and C(compress) for files that are not text.
+        type: path
     string_value:
         description:
             - Exclusive with [bytes_value] String formatted contents
         type: str
+    version:
+        description:
+            - Version to fetch with C(state=fetch). Defaults to the latest version.
+        type: str
 '''
 
 EXAMPLES = r'''
@@ -82,8 +143,34 @@ EXAMPLES = r'''
     - name: upload swagger file
       stored_object:
         state: present
-        string_value: "{{ lookup('file', '../swagger.json') | string }}"
+        src: "../swagger.json"
+        content_format: "json"
+        name: "demo-swagger"
+        object_type: "swagger"
+        namespace: "default"
+
+    - name: upload a large archive gzipped as binary content
+      stored_object:
+        state: present
+        src: "../bundle.tar"
+        compress: True
+        name: "demo-bundle"
+        object_type: "artifact"
+        namespace: "default"
+
+    - name: upload every spec of a directory
+      stored_object:
+        state: present
+        src: "../specs"
         content_format: "json"
+        object_type: "swagger"
+        namespace: "default"
+      register: specs
+
+    - name: download the swagger file back
+      stored_object:
+        state: fetch
+        dest: "../swagger.json"
         name: "demo-swagger"
         object_type: "swagger"
         namespace: "default"
@@ -130,6 +217,44 @@ metadata:
             - Version of the stored object
         type: str
         required: True
+files:
+    description:
+        - Result per file when C(src) is a directory.
+    returned: when C(src) is a directory
+    type: list
+    elements: dict
+    contains:
+        path:
+            description: Path of the file.
+            type: str
+        name:
+            description: Name of the stored object.
+            type: str
+        changed:
+            description: Whether a new version was uploaded.
+            type: bool
+        sha256:
+            description: sha256 of the content.
+            type: str
+        status:
+            description: Status of the upload, C(STORED_OBJECT_STATUS_ALREADY_EXISTS) when it was skipped.
+            type: str
+        version:
+            description: Version created by the upload.
+            type: str
+        failed:
+            description: Set when the file could not be uploaded, with the error in C(msg).
+            type: bool
+dest:
+    description:
+        - File the content was fetched to.
+    returned: when C(state) is C(fetch)
+    type: str
+sha256:
+    description:
+        - sha256 of the fetched content.
+    returned: when C(state) is C(fetch)
+    type: str
 status:
     type: str
     choices:
@@ -142,12 +267,21 @@ status:
           if object got created, updated or already exists.
 '''
 
+import fnmatch
+import os
+import tempfile
+
 from ansible.module_utils.basic import AnsibleModule
 
 from ..module_utils.client import XcRestClient
 from ..module_utils.common import (
     F5ModuleError, AnsibleF5Parameters, f5_argument_spec
 )
+from ..module_utils.concurrency import run_parallel
+from ..module_utils.object_store import (
+    base64_chunks, base64_length, content_digest, file_digest, gzip_file, latest_descriptor, list_stored_objects,
+    object_uri, put_file, save_content, stored_fields, text_chunks
+)
 
 
 class Parameters(AnsibleF5Parameters):
@@ -155,20 +289,6 @@ class Parameters(AnsibleF5Parameters):
 
     returnables = ['metadata', 'status']
 
-    def to_return(self):
-        result = {}
-        for returnable in self.returnables:
-            result[returnable] = getattr(self, returnable)
-        result = self._filter_params(result)
-        return result
-
-    def to_update(self):
-        result = {}
-        for updatebale in self.updatables:
-            result[updatebale] = getattr(self, updatebale)
-        result = self._filter_params(result)
-        return result
-
 
 class ModuleParameters(Parameters):
     @property
@@ -199,6 +319,10 @@ class ModuleParameters(Parameters):
     def string_value(self):
         return self._values['string_value']
 
+    @property
+    def content_sha256(self):
+        return content_digest(self.string_value, self.bytes_value)
+
 
 class ApiParameters(Parameters):
     @property
@@ -219,71 +343,212 @@ class ApiParameters(Parameters):
 
 
 class Changes(Parameters):
-    def to_return(self):
-        result = {}
-        try:
-            for returnable in self.returnables:
-                result[returnable] = getattr(self, returnable)
-            result = self._filter_params(result)
-        except Exception:
-            raise
-        return result
-
-    def to_update(self):
-        result = {}
-        try:
-            for updatebale in self.updatables:
-                result[updatebale] = getattr(self, updatebale)
-            result = self._filter_params(result)
-        except Exception:
-            raise
-        return result
+    pass
 
 
 class ModuleManager(object):
     def __init__(self, *args, **kwargs):
         self.module = kwargs.get('module', None)
-        self.client = XcRestClient(**self.module.params)
-
         self.want = ModuleParameters(params=self.module.params)
         self.have = ApiParameters()
+        self._upload = None
+        self.fetched = dict()
+        self.files = None
+
+        # A directory is uploaded by several threads sharing pooled connections.
+        self.directory = self.want.state == 'present' and bool(self.want.src) and os.path.isdir(self.want.src)
+        pool_size = self.want.parallelism if self.directory else None
+        self.client = XcRestClient(pool_size=pool_size, **self.module.params)
 
     def exec_module(self):
         changed = False
         result = dict()
         state = self.want.state
 
+        if not self.want.name and not self.directory:
+            raise F5ModuleError("name is required unless src is a directory")
+
         if state == 'present':
             changed = self.present()
         elif state == 'absent':
             changed = self.absent()
+        elif state == 'fetch':
+            changed = self.fetch()
 
         changes = self.have.to_return()
         result.update(**changes)
+        result.update(self.fetched)
+        if self.files is not None:
+            result.update(files=self.files)
+            errors = ['{path}: {msg}'.format(**entry) for entry in self.files if entry.get('failed')]
+            if errors:
+                result.update(failed=True, msg="Uploading {0} failed: {1}".format(self.want.src, '; '.join(errors)))
         result.update(dict(changed=changed))
         return result
 
     def present(self):
+        if self.directory:
+            return self.sync()
+        if not self.want.force and self.is_stored(self.want.name, self.want_digest):
+            return self.unchanged()
         return self.create()
 
+    def is_stored(self, name, digest):
+        """Whether the latest version of ``name`` holds the content hashing to ``digest()``
+        and the ``content_format`` and ``description`` given."""
+        # The stored content is hashed as it streams in, never held whole.
+        fields = ('content_format', 'description')
+        stored = stored_fields(self.client, self.want.namespace, self.want.object_type, name, fields)
+        if stored is None:
+            return False
+        if any(getattr(self.want, field) not in (None, stored[1][field]) for field in fields):
+            return False
+        return stored[0] == digest()
+
+    def prepare_upload(self, src):
+        """``(path, field, encode, length)`` of the content to stream from ``src``."""
+        path = src
+        if self.want.compress:
+            fd, path = tempfile.mkstemp(suffix='.gz', dir=self.module.tmpdir)
+            os.close(fd)
+            gzip_file(src, path)
+        if self.want.binary or self.want.compress:
+            return path, 'bytes_value', base64_chunks, base64_length(path)
+        return path, 'string_value', text_chunks, None
+
+    def upload(self):
+        if self._upload is None:
+            self._upload = self.prepare_upload(self.want.src)
+        return self._upload
+
+    def put_file(self, name, upload):
+        path, field, encode, length = upload
+        return put_file(
+            self.client, self.want.namespace, self.want.object_type, name, path, self.want.to_update(),
+            field=field, encode=encode, length=length,
+        )
+
+    def source_files(self):
+        """``(path, name)`` of the files below the ``src`` directory, in path order."""
+        root = self.want.src
+        result = []
+        names = dict()
+        for directory, dirs, files in os.walk(root):
+            dirs.sort()
+            for filename in sorted(files):
+                if not any(fnmatch.fnmatch(filename, pattern) for pattern in self.want.patterns):
+                    continue
+                path = os.path.join(directory, filename)
+                name = os.path.splitext(os.path.relpath(path, root))[0].replace(os.sep, '-')
+                if self.want.name:
+                    name = '{0}-{1}'.format(self.want.name, name)
+                if name in names:
+                    raise F5ModuleError("{0} and {1} would both be stored as {2}".format(names[name], path, name))
+                names[name] = path
+                result.append((path, name))
+        return result
+
+    def sync(self):
+        files = self.source_files()
+        existing = set(
+            obj.get('name') for obj in
+            list_stored_objects(self.client, self.want.namespace, self.want.object_type, latest_only=True)
+        )
+        if self.want.compress:
+            # Create the temporary directory before the worker threads use it.
+            self.module.tmpdir
+
+        def sync_file(entry):
+            path, name = entry
+            upload = self.prepare_upload(path)
+            digest = file_digest(upload[0])
+            if name in existing and not self.want.force and self.is_stored(name, lambda: digest):
+                return dict(changed=False, sha256=digest, status='STORED_OBJECT_STATUS_ALREADY_EXISTS')
+            response = self.put_file(name, upload).json()
+            return dict(
+                changed=True,
+                sha256=digest,
+                status=response.get('status'),
+                version=(response.get('metadata') or {}).get('version'),
+            )
+
+        self.files = []
+        for (path, name), (result, error) in zip(files, run_parallel(sync_file, files, self.want.parallelism)):
+            entry = dict(path=path, name=name)
+            if error is not None:
+                entry.update(changed=False, failed=True, msg=str(error))
+            else:
+                entry.update(result)
+            self.files.append(entry)
+        return any(entry['changed'] for entry in self.files)
+
+    def want_digest(self):
+        if self.want.src:
+            return file_digest(self.upload()[0])
+        return self.want.content_sha256
+
     def absent(self):
-        if self.exists():
-            return self.remove()
-        return False
+        metadata = latest_descriptor(self.client, self.want.namespace, self.want.object_type, self.want.name)
+        if metadata is None:
+            return False
+        self.have = ApiParameters(params=dict(metadata=metadata))
+        return self.remove()
 
     def remove(self):
-        uri = f"/api/object_store/namespaces/{self.want.namespace}/stored_objects/{self.want.object_type}/{self.want.name}"
+        uri = object_uri(self.want.namespace, self.want.object_type, self.want.name)
         response = self.client.api.delete(url=uri)
         if response.status == 404:
             return False
         if response.status not in [200, 201, 202]:
             raise F5ModuleError(response.content)
+        return True
 
-    def create(self):
-        uri = f"/api/object_store/namespaces/{self.want.namespace}/stored_objects/{self.want.object_type}/{self.want.name}"
-        response = self.client.api.put(url=uri, json=self.want.to_update())
+    def unchanged(self):
+        # The latest version already holds this content; report it the way
+        # the API reports an upload of identical content.
+        metadata = latest_descriptor(
+            self.client, self.want.namespace, self.want.object_type, self.want.name
+        )
+        self.have = ApiParameters(params=dict(metadata=metadata, status='STORED_OBJECT_STATUS_ALREADY_EXISTS'))
+        return False
+
+    def fetch(self):
+        dest = self.want.dest
+        digest = file_digest(dest) if os.path.isfile(dest) else None
+        if digest is not None and digest == self.want.checksum:
+            self.fetched = dict(dest=dest, sha256=digest)
+            return False
+
+        uri = object_uri(self.want.namespace, self.want.object_type, self.want.name, self.want.version)
+        response = self.client.api.get(url=uri, stream=True)
+        if response.status == 404:
+            raise F5ModuleError("Stored object {0} not found".format(uri))
         if response.status not in [200, 201, 202]:
             raise F5ModuleError(response.content)
+
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(dest)), suffix='.part')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                fetched = save_content(response, f)
+        except Exception:
+            response.close()
+            os.remove(tmp)
+            raise
+        self.fetched = dict(dest=dest, sha256=fetched)
+        if fetched == digest:
+            os.remove(tmp)
+            return False
+        self.module.atomic_move(tmp, dest)
+        return True
+
+    def create(self):
+        if self.want.src:
+            response = self.put_file(self.want.name, self.upload())
+        else:
+            uri = object_uri(self.want.namespace, self.want.object_type, self.want.name)
+            response = self.client.api.put(url=uri, json=self.want.to_update())
+            if response.status not in [200, 201, 202]:
+                raise F5ModuleError(response.content)
         self.have = ApiParameters(params=response.json())
         return True
 
@@ -295,14 +560,22 @@ class ArgumentSpec(object):
         argument_spec = dict(
             state=dict(
                 default='present',
-                choices=['present', 'absent']
+                choices=['present', 'absent', 'fetch']
             ),
-            bytes_value=dict(type=dict),
+            checksum=dict(type='str'),
+            dest=dict(type='path'),
+            binary=dict(type='bool', default=False),
+            bytes_value=dict(type='str'),
+            compress=dict(type='bool', default=False),
             content_format=dict(type='str'),
             description=dict(type='str'),
-            name=dict(required=True, type='str'),
+            force=dict(type='bool', default=False),
+            name=dict(type='str'),
             namespace=dict(required=True, type='str'),
             object_type=dict(required=True, type='str'),
+            parallelism=dict(type='int', default=8),
+            patterns=dict(type='list', elements='str', default=['*.json', '*.yaml', '*.yml']),
+            src=dict(type='path'),
             string_value=dict(type='str'),
             version=dict(type='str'),
 
@@ -310,6 +583,12 @@ class ArgumentSpec(object):
         self.argument_spec = {}
         self.argument_spec.update(f5_argument_spec)
         self.argument_spec.update(argument_spec)
+        self.mutually_exclusive = [
+            ['src', 'string_value', 'bytes_value'],
+        ]
+        self.required_if = [
+            ['state', 'fetch', ['dest']],
+        ]
 
 
 def main():
@@ -317,11 +596,15 @@ def main():
 
     module = AnsibleModule(
         argument_spec=spec.argument_spec,
-        supports_check_mode=spec.supports_check_mode
+        supports_check_mode=spec.supports_check_mode,
+        mutually_exclusive=spec.mutually_exclusive,
+        required_if=spec.required_if,
     )
     try:
         mm = ModuleManager(module=module)
         results = mm.exec_module()
+        if results.get('failed'):
+            module.fail_json(**results)
         module.exit_json(**results)
     except F5ModuleError as ex:
         module.fail_json(msg=str(ex))
@@ -0,0 +1,343 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# GNU General Public License v3.0 (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+DOCUMENTATION = r'''
+---
+module: xc_apply
+short_description: Apply a set of xC configuration objects in dependency order
+description:
+    - Creates or updates many configuration objects of any kind in one task.
+    - Objects are ordered by the references between them (load balancer to origin pools, app firewall,
+      service policies and API definition; origin pool to health checks; API definition to stored objects),
+      so referenced objects are applied first.
+    - Objects that do not depend on each other are applied concurrently over a pool of keep-alive connections.
+version_added: "0.0.7"
+options:
+    objects:
+        description:
+            - Objects to apply.
+        type: list
+        elements: dict
+        required: True
+        suboptions:
+            kind:
+                description:
+                    - Kind of the object, as for M(yoctoalex.xc_cloud_modules.xc_config_object).
+                type: str
+                required: True
+            metadata:
+                description:
+                    - Metadata of the object, C(name) and (for namespaced kinds) C(namespace) are required.
+                type: dict
+                required: True
+            spec:
+                description:
+                    - Specification of the object.
+                type: dict
+            patch:
+                description:
+                    - Merge C(spec) with the object on cloud instead of replacing it.
+                type: bool
+                default: False
+            list_merge:
+                description:
+                    - With C(patch), C(merge) merges lists of named entries entry by entry and C(replace)
+                      replaces every list as a whole, as for M(yoctoalex.xc_cloud_modules.xc_config_object).
+                type: str
+                choices:
+                  - merge
+                  - replace
+                default: replace
+            wait:
+                description:
+                    - Wait for kinds with initializers (C(namespace), C(virtual_k8s)) to be ready.
+                type: bool
+                default: False
+    parallelism:
+        description:
+            - Maximum number of objects applied or removed at the same time, and of open connections.
+        type: int
+        default: 8
+    prune:
+        description:
+            - After a successful apply, remove objects that are not in C(objects).
+            - Every kind in C(prune_kinds) is listed once in every namespace used by C(objects),
+              and objects missing from C(objects) are removed, referring kinds before referred ones.
+        type: bool
+        default: False
+    prune_kinds:
+        description:
+            - Kinds considered by C(prune). Defaults to the kinds used in C(objects).
+        type: list
+        elements: str
+    prune_selector:
+        description:
+            - Only prune objects carrying all of these labels.
+        type: dict
+    prune_wait:
+        description:
+            - Wait for each removal level of C(prune) to disappear before removing the next one,
+              so that no object is removed while another one still refers to it.
+        type: bool
+        default: True
+    prune_timeout:
+        description:
+            - Seconds to wait for one removal level of C(prune) to disappear.
+        type: int
+        default: 900
+notes:
+    - Stored objects are not applied by this module, use M(yoctoalex.xc_cloud_modules.stored_object).
+      References to them (and to any object missing from C(objects)) are expected to exist already.
+    - When an object fails, the remaining objects of its level still run, but later levels are skipped.
+    - C(prune) leaves tenant level kinds such as C(namespace) and objects owned by other objects alone.
+'''
+
+EXAMPLES = r'''
+---
+- name: Configure an application
+  hosts: webservers
+  collections:
+    - yoctoalex.xc_cloud_modules
+  connection: local
+
+  environment:
+    XC_API_TOKEN: "your_api_token"
+    XC_TENANT: "console.ves.volterra.io"
+
+  tasks:
+    - name: apply load balancer with its pool and health check
+      xc_apply:
+        objects:
+          - kind: http_loadbalancer
+            metadata:
+              namespace: "default"
+              name: "demo-http-lb"
+            spec:
+              domains:
+                - "example.com"
+              http:
+                port: 80
+              default_route_pools:
+                - pool:
+                    namespace: "default"
+                    name: "demo-pool"
+                  weight: 1
+                  priority: 1
+          - kind: origin_pool
+            metadata:
+              namespace: "default"
+              name: "demo-pool"
+            spec:
+              origin_servers:
+                - public_name:
+                    dns_name: "demo.example.com"
+              port: 443
+              healthcheck:
+                - namespace: "default"
+                  name: "demo-hc"
+          - kind: healthcheck
+            metadata:
+              namespace: "default"
+              name: "demo-hc"
+            spec:
+              http_health_check:
+                path: "/healthz"
+
+    - name: remove load balancers and pools labelled for this app that are no longer listed
+      xc_apply:
+        objects: "{{ app_objects }}"
+        prune: True
+        prune_kinds:
+          - http_loadbalancer
+          - origin_pool
+        prune_selector:
+          app: "demo"
+'''
+
+RETURN = r'''
+---
+objects:
+    description:
+        - Result per object, in the order they were applied.
+    returned: always
+    type: list
+    elements: dict
+    contains:
+        kind:
+            description: Kind of the object.
+            type: str
+        namespace:
+            description: Namespace of the object.
+            type: str
+        name:
+            description: Name of the object.
+            type: str
+        level:
+            description: Dependency level the object was applied in, starting at 0.
+            type: int
+        changed:
+            description: Whether the object was created or updated.
+            type: bool
+        failed:
+            description: Set when applying the object failed, with the error in C(msg).
+            type: bool
+levels:
+    description:
+        - Number of objects and wall clock seconds per dependency level.
+    returned: always
+    type: list
+    elements: dict
+pruned:
+    description:
+        - Result per object removed by C(prune), with the same keys as C(objects).
+    returned: when C(prune) is True
+    type: list
+    elements: dict
+prune_levels:
+    description:
+        - Number of objects and wall clock seconds per removal level.
+    returned: when C(prune) is True
+    type: list
+    elements: dict
+elapsed:
+    description:
+        - Wall clock seconds for the whole apply.
+    returned: always
+    type: float
+'''
+
+import time
+
+from ansible.module_utils.basic import AnsibleModule
+
+from ..module_utils.batch import BatchItem, live_items, plan, removal_levels, run_levels, wait_removed
+from ..module_utils.client import XcRestClient
+from ..module_utils.common import F5ModuleError, f5_argument_spec
+from ..module_utils.kinds import get_kind
+from ..module_utils.resource import ConfigObjectManager
+
+
+class ModuleManager(object):
+    def __init__(self, *args, **kwargs):
+        self.module = kwargs.get('module', None)
+        self.params = self.module.params
+        self.client = XcRestClient(provider=self.params['provider'], pool_size=self.params['parallelism'])
+
+    def exec_module(self):
+        start = time.time()
+        items = [
+            BatchItem(obj['kind'], dict(
+                state='present', metadata=obj['metadata'], spec=obj['spec'] or {},
+                patch=obj['patch'], list_merge=obj['list_merge'], wait=obj['wait'],
+            ))
+            for obj in self.params['objects']
+        ]
+        for item in items:
+            if item.key[0] == 'stored_object':
+                raise F5ModuleError("stored_object {0} cannot be applied by xc_apply".format(item.key[2]))
+        levels = plan(items)
+        results, timings, failed = run_levels(levels, self.apply, self.params['parallelism'])
+        result = dict(
+            objects=results,
+            levels=timings,
+        )
+        if failed:
+            result.update(failed=True, msg="Failed to apply {0}".format(', '.join(
+                '{kind} {name}'.format(**entry) for entry in results if entry.get('failed')
+            )))
+        elif self.params['prune']:
+            pruned, timings, failed = self.prune(items)
+            result.update(pruned=pruned, prune_levels=timings)
+            if failed:
+                errors = ['{kind} {name}: {msg}'.format(**entry) for entry in pruned if entry.get('failed')]
+                errors.extend(timing['msg'] for timing in timings if timing.get('failed'))
+                result.update(failed=True, msg="Failed to prune: {0}".format('; '.join(errors)))
+        result.update(changed=any(entry['changed'] for entry in results + result.get('pruned', [])))
+        result.update(elapsed=round(time.time() - start, 3))
+        return result
+
+    def prune(self, items):
+        kinds = [get_kind(kind) for kind in self.params['prune_kinds'] or []] or [item.kind for item in items]
+        namespaces = []
+        for item in items:
+            if item.key[1] and item.key[1] not in namespaces:
+                namespaces.append(item.key[1])
+        scopes = []
+        for kind in kinds:
+            if not kind.namespaced or kind.kind == 'stored_object':
+                continue
+            for namespace in namespaces:
+                if (kind, namespace) not in scopes:
+                    scopes.append((kind, namespace))
+        wanted = set(item.key for item in items)
+        extra = [
+            item for item in live_items(self.client, scopes, self.params['prune_selector'], self.params['parallelism'])
+            if item.key not in wanted
+        ]
+        settle = self.settle if self.params['prune_wait'] else None
+        return run_levels(removal_levels(extra), self.remove, self.params['parallelism'], settle)
+
+    def apply(self, item):
+        result = ConfigObjectManager(params=item.params, kind=item.kind, client=self.client).exec_module()
+        return dict(changed=result['changed'])
+
+    def remove(self, item):
+        return dict(changed=ConfigObjectManager(params=item.params, kind=item.kind, client=self.client).remove())
+
+    def settle(self, items):
+        wait_removed(self.client, items, self.params['prune_timeout'], self.params['parallelism'])
+
+
+class ArgumentSpec(object):
+    def __init__(self):
+        self.supports_check_mode = False
+        argument_spec = dict(
+            objects=dict(
+                type='list',
+                elements='dict',
+                required=True,
+                options=dict(
+                    kind=dict(type='str', required=True),
+                    metadata=dict(type='dict', required=True),
+                    spec=dict(type='dict'),
+                    patch=dict(type='bool', default=False),
+                    list_merge=dict(type='str', default='replace', choices=['merge', 'replace']),
+                    wait=dict(type='bool', default=False),
+                ),
+            ),
+            parallelism=dict(type='int', default=8),
+            prune=dict(type='bool', default=False),
+            prune_kinds=dict(type='list', elements='str'),
+            prune_selector=dict(type='dict'),
+            prune_wait=dict(type='bool', default=True),
+            prune_timeout=dict(type='int', default=900),
+        )
+        self.argument_spec = {}
+        self.argument_spec.update(f5_argument_spec)
+        self.argument_spec.update(argument_spec)
+
+
+def main():
+    spec = ArgumentSpec()
+
+    module = AnsibleModule(
+        argument_spec=spec.argument_spec,
+        supports_check_mode=spec.supports_check_mode
+    )
+    try:
+        mm = ModuleManager(module=module)
+        results = mm.exec_module()
+        if results.get('failed'):
+            module.fail_json(**results)
+        module.exit_json(**results)
+    except F5ModuleError as ex:
+        module.fail_json(msg=str(ex))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# GNU General Public License v3.0 (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+DOCUMENTATION = r'''
+---
+module: xc_config_object
+short_description: Manage any xC configuration object
+description:
+    - Creates, updates, removes or fetches a configuration object of any kind.
+    - URIs, readiness checks and spec defaults come from the kind registry in C(module_utils/kinds.py).
+      Kinds missing from the registry are addressed as C(/api/config/namespaces/{namespace}/{kind}s).
+    - One module serves every kind, so a play that manages many kinds ships a single module payload.
+version_added: "0.0.7"
+options:
+    kind:
+        description:
+            - Kind of the configuration object, for example C(origin_pool), C(http_loadbalancer) or C(healthcheck).
+        type: str
+        required: True
+    spec:
+        description:
+            - Specification of the object, in the shape documented for the kind
+              https://docs.cloud.f5.com/docs/api
+        type: object
+notes:
+    - C(wait) applies only to kinds that report readiness through initializers (C(namespace), C(virtual_k8s)).
+extends_documentation_fragment:
+  - yoctoalex.xc_cloud_modules.config_object
+  - yoctoalex.xc_cloud_modules.config_object.patch
+  - yoctoalex.xc_cloud_modules.config_object.wait
+'''
+
+EXAMPLES = r'''
+---
+- name: Configure objects of several kinds
+  hosts: webservers
+  collections:
+    - yoctoalex.xc_cloud_modules
+  connection: local
+
+  environment:
+    XC_API_TOKEN: "your_api_token"
+    XC_TENANT: "console.ves.volterra.io"
+
+  tasks:
+    - name: create health check
+      xc_config_object:
+        kind: healthcheck
+        metadata:
+          namespace: "default"
+          name: "demo-hc"
+        spec:
+          http_health_check:
+            path: "/healthz"
+          timeout: 3
+          interval: 15
+          unhealthy_threshold: 1
+          healthy_threshold: 3
+
+    - name: create origin pool
+      xc_config_object:
+        kind: origin_pool
+        metadata:
+          namespace: "default"
+          name: "demo-pool"
+        spec:
+          origin_servers:
+            - public_name:
+                dns_name: "demo.example.com"
+          port: 443
+          healthcheck:
+            - namespace: "default"
+              name: "demo-hc"
+'''
+
+RETURN = r'''
+---
+metadata:
+    description:
+        - Metadata of the object as stored on cloud.
+    type: object
+spec:
+    description:
+        - Specification of the object as stored on cloud.
+    type: object
+list_changes:
+    description:
+        - For kinds with keyed lists (C(http_loadbalancer) routes, C(service_policy) rules),
+          the changes an update made to them.
+    returned: when an existing object was updated
+    type: dict
+'''
+
+from ansible.module_utils.basic import AnsibleModule
+
+from ..module_utils.common import F5ModuleError
+from ..module_utils.diff import diff_lists
+from ..module_utils.kinds import get_kind
+from ..module_utils.resource import ConfigObjectManager, config_object_argument_spec
+
+
+class ArgumentSpec(object):
+    def __init__(self):
+        self.supports_check_mode = False
+        self.argument_spec = config_object_argument_spec(
+            spec=dict(type='dict', default={}), namespaced=False, patch=True, wait=True,
+        )
+        self.argument_spec.update(
+            kind=dict(type='str', required=True),
+        )
+
+
+def main():
+    spec = ArgumentSpec()
+
+    module = AnsibleModule(
+        argument_spec=spec.argument_spec,
+        supports_check_mode=spec.supports_check_mode
+    )
+    try:
+        mm = ConfigObjectManager(module=module, kind=get_kind(module.params['kind']), list_diff=diff_lists)
+        results = mm.exec_module()
+        module.exit_json(**results)
+    except F5ModuleError as ex:
+        module.fail_json(msg=str(ex))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,289 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# GNU General Public License v3.0 (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+DOCUMENTATION = r'''
+---
+module: xc_credentials_revoke
+short_description: Revoke many API credentials at once
+description:
+    - Lists the API credentials of a namespace once, selects those matching every given filter
+      and revokes them concurrently, at most C(rate) per second.
+    - At least one of C(expires_within), C(types), C(name_patterns) and C(orphaned) is required.
+    - Credentials the listing reports as inactive are left alone.
+version_added: "0.0.7"
+options:
+    namespace:
+        description:
+            - Namespace of the credentials.
+        type: str
+        default: system
+    expires_within:
+        description:
+            - Only revoke credentials expiring in less than this many seconds. C(0) selects expired credentials.
+        type: int
+    types:
+        description:
+            - Only revoke credentials of these types, for example C(KUBE_CONFIG).
+        type: list
+        elements: str
+    name_patterns:
+        description:
+            - Only revoke credentials whose name matches one of these shell patterns.
+        type: list
+        elements: str
+    orphaned:
+        description:
+            - Only revoke credentials issued for a virtual K8s cluster that no longer exists.
+            - The virtual K8s objects are listed once per namespace the credentials refer to.
+        type: bool
+        default: False
+    cache:
+        description:
+            - Credential cache of M(yoctoalex.xc_cloud_modules.api_credentials) to remove the revoked credentials from.
+        type: path
+    rate:
+        description:
+            - Maximum number of revocations started per second. C(0) does not limit them.
+            - Requests the API turns down as too many are retried later.
+        type: float
+        default: 10
+    parallelism:
+        description:
+            - Maximum number of revocations at the same time, and of open connections.
+        type: int
+        default: 8
+notes:
+    - In check mode the matching credentials are reported and nothing is revoked.
+'''
+
+EXAMPLES = r'''
+---
+- name: Clean up credentials
+  hosts: webservers
+  collections:
+    - yoctoalex.xc_cloud_modules
+  connection: local
+
+  environment:
+    XC_API_TOKEN: "your_api_token"
+    XC_TENANT: "console.ves.volterra.io"
+
+  tasks:
+    - name: revoke the kubeconfigs of removed clusters
+      xc_credentials_revoke:
+        types:
+          - KUBE_CONFIG
+        orphaned: True
+
+    - name: revoke CI tokens expiring within a day
+      xc_credentials_revoke:
+        name_patterns:
+          - "ci-*"
+        expires_within: 86400
+        rate: 5
+'''
+
+RETURN = r'''
+---
+credentials:
+    description:
+        - The matching credentials.
+    returned: always
+    type: list
+    elements: dict
+    contains:
+        name:
+            description: Name of the credential.
+            type: str
+        type:
+            description: Type of the credential.
+            type: str
+        expiry_timestamp:
+            description: When the credential expires.
+            type: str
+        revoked:
+            description: Whether the credential was revoked.
+            type: bool
+        failed:
+            description: Set when revoking failed, with the error in C(msg).
+            type: bool
+matched:
+    description:
+        - Number of matching credentials.
+    returned: always
+    type: int
+revoked:
+    description:
+        - Number of credentials revoked.
+    returned: always
+    type: int
+failed_count:
+    description:
+        - Number of credentials that could not be revoked.
+    returned: always
+    type: int
+'''
+
+import fnmatch
+import time
+
+from ansible.module_utils.basic import AnsibleModule
+
+from ..module_utils.batch import list_objects
+from ..module_utils.client import XcRestClient
+from ..module_utils.common import F5ModuleError, f5_argument_spec
+from ..module_utils.concurrency import RateLimiter, run_parallel
+from ..module_utils.credentials import CredentialCache, expiry, list_credentials, revoke_credential
+from ..module_utils.kinds import KINDS
+
+API_TYPES = [
+    'API_CERTIFICATE',
+    'KUBE_CONFIG',
+    'API_TOKEN',
+    'SERVICE_API_TOKEN',
+    'SERVICE_API_CERTIFICATE',
+    'SERVICE_KUBE_CONFIG',
+    'SITE_GLOBAL_KUBE_CONFIG',
+    'SCIM_API_TOKEN',
+    'SERVICE_SITE_GLOBAL_KUBE_CONFIG',
+]
+
+
+class ModuleManager(object):
+    def __init__(self, *args, **kwargs):
+        self.module = kwargs.get('module', None)
+        self.params = self.module.params
+        self.client = XcRestClient(provider=self.params['provider'], pool_size=self.params['parallelism'])
+
+    def live_clusters(self, credentials):
+        namespaces = sorted(set(
+            credential.get('virtual_k8s_namespace') for credential in credentials if credential.get('virtual_k8s_name')
+        ))
+        listings = run_parallel(
+            lambda namespace: list_objects(self.client, KINDS['virtual_k8s'], namespace), namespaces,
+            self.params['parallelism'],
+        )
+        result = set()
+        for namespace, (listing, error) in zip(namespaces, listings):
+            if error is not None:
+                raise error
+            result.update((namespace, obj.get('name')) for obj in listing)
+        return result
+
+    def select(self, credentials):
+        params = self.params
+        deadline = time.time() + params['expires_within'] if params['expires_within'] is not None else None
+        result = []
+        for credential in credentials:
+            if credential.get('active') is False:
+                continue
+            if params['types'] and credential.get('type') not in params['types']:
+                continue
+            name = credential.get('name') or ''
+            if params['name_patterns'] and not any(fnmatch.fnmatch(name, p) for p in params['name_patterns']):
+                continue
+            if deadline is not None:
+                expires = expiry(credential)
+                if expires is None or expires >= deadline:
+                    continue
+            result.append(credential)
+        if params['orphaned']:
+            live = self.live_clusters(result)
+            result = [
+                credential for credential in result if credential.get('virtual_k8s_name') and
+                (credential.get('virtual_k8s_namespace'), credential['virtual_k8s_name']) not in live
+            ]
+        return result
+
+    def exec_module(self):
+        params = self.params
+        if params['expires_within'] is None and not (params['types'] or params['name_patterns'] or params['orphaned']):
+            raise F5ModuleError("One of expires_within, types, name_patterns or orphaned is required")
+
+        selected = self.select(list_credentials(self.client, params['namespace']))
+        entries = [
+            dict(
+                name=credential.get('name'),
+                type=credential.get('type'),
+                expiry_timestamp=credential.get('expiry_timestamp') or credential.get('expiration_timestamp'),
+                revoked=False,
+            )
+            for credential in selected
+        ]
+        if not self.module.check_mode:
+            limiter = RateLimiter(params['rate'])
+
+            def revoke(entry):
+                limiter.wait()
+                return revoke_credential(self.client, params['namespace'], entry['name'])
+
+            for entry, (revoked, error) in zip(entries, run_parallel(revoke, entries, params['parallelism'])):
+                if error is not None:
+                    entry.update(failed=True, msg=str(error))
+                else:
+                    entry.update(revoked=revoked)
+            if params['cache']:
+                cache = CredentialCache(params['cache'])
+                if any([cache.discard(entry['name']) for entry in entries if not entry.get('failed')]):
+                    try:
+                        cache.save()
+                    except F5ModuleError as ex:
+                        self.module.warn(str(ex))
+
+        failed = [entry for entry in entries if entry.get('failed')]
+        result = dict(
+            credentials=entries,
+            matched=len(entries),
+            revoked=sum(1 for entry in entries if entry['revoked']),
+            failed_count=len(failed),
+        )
+        result.update(changed=result['revoked'] > 0 or (self.module.check_mode and bool(entries)))
+        if failed:
+            result.update(failed=True, msg="Revoking {0} of {1} credentials failed: {2}".format(
+                len(failed), len(entries), '; '.join('{name}: {msg}'.format(**entry) for entry in failed)
+            ))
+        return result
+
+
+class ArgumentSpec(object):
+    def __init__(self):
+        self.supports_check_mode = True
+        argument_spec = dict(
+            namespace=dict(type='str', default='system'),
+            expires_within=dict(type='int'),
+            types=dict(type='list', elements='str', choices=API_TYPES),
+            name_patterns=dict(type='list', elements='str'),
+            orphaned=dict(type='bool', default=False),
+            cache=dict(type='path'),
+            rate=dict(type='float', default=10),
+            parallelism=dict(type='int', default=8),
+        )
+        self.argument_spec = {}
+        self.argument_spec.update(f5_argument_spec)
+        self.argument_spec.update(argument_spec)
+
+
+def main():
+    spec = ArgumentSpec()
+
+    module = AnsibleModule(
+        argument_spec=spec.argument_spec,
+        supports_check_mode=spec.supports_check_mode
+    )
+    try:
+        mm = ModuleManager(module=module)
+        results = mm.exec_module()
+        if results.get('failed'):
+            module.fail_json(**results)
+        module.exit_json(**results)
+    except F5ModuleError as ex:
+        module.fail_json(msg=str(ex))
+
+
+if __name__ == '__main__':
+    main()
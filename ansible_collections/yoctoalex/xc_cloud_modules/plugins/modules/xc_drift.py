@@ -0,0 +1,300 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# GNU General Public License v3.0 (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+DOCUMENTATION = r'''
+---
+module: xc_drift
+short_description: Report differences between desired state files and live objects
+description:
+    - Reads desired objects from the YAML and JSON files of a directory and compares them with the objects on cloud,
+      without changing anything.
+    - Each kind is listed once per namespace used by the desired objects, together with the spec of every
+      object. Only objects the listing reports without their spec are fetched, concurrently.
+    - An object has drifted when a value it states differs on cloud; fields set by the server alone
+      (defaults, C(system_metadata)) are not reported.
+version_added: "0.0.7"
+options:
+    src:
+        description:
+            - Directory searched recursively for C(.yml), C(.yaml) and C(.json) files.
+            - Each file holds one object, a list of objects or, for YAML, several documents.
+              An object has C(kind), C(metadata) and C(spec), as in M(yoctoalex.xc_cloud_modules.xc_apply).
+        type: path
+        required: True
+    dest:
+        description:
+            - Write the report as JSON to this file as well. Not written in check mode.
+        type: path
+    extra:
+        description:
+            - Also report objects on cloud that no file describes, for the kinds and namespaces the files use.
+        type: bool
+        default: True
+    parallelism:
+        description:
+            - Maximum number of objects fetched at the same time, and of open connections.
+        type: int
+        default: 8
+notes:
+    - A key set to null in C(spec) stands for an empty option, which is how the API reports a selected oneof choice.
+requirements:
+    - PyYAML
+'''
+
+EXAMPLES = r'''
+---
+- name: Morning drift report
+  hosts: webservers
+  collections:
+    - yoctoalex.xc_cloud_modules
+  connection: local
+
+  environment:
+    XC_API_TOKEN: "your_api_token"
+    XC_TENANT: "console.ves.volterra.io"
+
+  tasks:
+    - name: compare live objects with the repository
+      xc_drift:
+        src: "{{ playbook_dir }}/desired"
+        dest: "/var/reports/xc-drift.json"
+        parallelism: 16
+      register: drift
+
+    - debug:
+        msg: "{{ drift.changed_objects | length }} objects drifted"
+'''
+
+RETURN = r'''
+---
+missing:
+    description:
+        - Desired objects that do not exist, as C(kind/namespace/name).
+    returned: always
+    type: list
+    elements: str
+extra:
+    description:
+        - Objects on cloud no file describes, as C(kind/namespace/name).
+    returned: when C(extra) is True
+    type: list
+    elements: str
+changed_objects:
+    description:
+        - Objects that differ, with the dotted paths of the differing values.
+    returned: always
+    type: list
+    elements: dict
+    sample:
+        - key: "http_loadbalancer/default/demo-http-lb"
+          file: "desired/lb.yaml"
+          paths:
+            - "spec.routes[0].simple_route.path.prefix"
+unchanged:
+    description:
+        - Number of desired objects that match.
+    returned: always
+    type: int
+elapsed:
+    description:
+        - Wall clock seconds for the report.
+    returned: always
+    type: float
+'''
+
+import json
+import os
+import time
+
+from ansible.module_utils.basic import AnsibleModule, missing_required_lib
+
+from ..module_utils.batch import BatchItem, fetch_object, list_objects
+from ..module_utils.client import XcRestClient
+from ..module_utils.common import F5ModuleError, f5_argument_spec
+from ..module_utils.concurrency import imap_unordered, run_parallel
+from ..module_utils.diff import changed_paths
+
+try:
+    import yaml
+    HAS_YAML = True
+except ImportError:
+    HAS_YAML = False
+
+METADATA_FIELDS = ('name', 'namespace', 'labels', 'annotations', 'description', 'disable')
+
+
+def load_documents(path):
+    with open(path) as f:
+        if path.endswith('.json'):
+            documents = [json.load(f)]
+        else:
+            documents = list(yaml.safe_load_all(f))
+    for document in documents:
+        for obj in document if isinstance(document, list) else [document]:
+            if obj:
+                yield obj
+
+
+def desired_files(src):
+    for root, dirs, files in os.walk(src):
+        dirs.sort()
+        for name in sorted(files):
+            if name.endswith(('.yml', '.yaml', '.json')):
+                yield os.path.join(root, name)
+
+
+def normalize_spec(value):
+    """Desired spec with null options turned into the empty objects the API reports."""
+    if isinstance(value, dict):
+        return dict((k, {} if v is None else normalize_spec(v)) for k, v in value.items())
+    if isinstance(value, list):
+        return [normalize_spec(v) for v in value]
+    return value
+
+
+def listed_object(obj, namespace):
+    """The object a listing with ``report_fields`` describes, or None without its spec."""
+    if obj.get('get_spec') is None:
+        return None
+    metadata = obj.get('metadata') or dict(
+        name=obj.get('name'),
+        namespace=obj.get('namespace') or namespace,
+        labels=obj.get('labels'),
+        annotations=obj.get('annotations'),
+        description=obj.get('description'),
+        disable=obj.get('disabled'),
+    )
+    return dict(metadata=metadata, spec=obj['get_spec'])
+
+
+def comparable(obj):
+    metadata = obj.get('metadata') or {}
+    return dict(
+        metadata=dict((k, metadata[k]) for k in METADATA_FIELDS if metadata.get(k) not in (None, {}, '')),
+        spec=normalize_spec(obj.get('spec') or {}),
+    )
+
+
+class ModuleManager(object):
+    def __init__(self, *args, **kwargs):
+        self.module = kwargs.get('module', None)
+        self.params = self.module.params
+        self.client = XcRestClient(provider=self.params['provider'], pool_size=self.params['parallelism'])
+
+    def desired(self):
+        items = {}
+        for path in desired_files(self.params['src']):
+            for obj in load_documents(path):
+                if not isinstance(obj, dict) or not obj.get('kind'):
+                    raise F5ModuleError("{0}: objects need a kind, metadata and spec".format(path))
+                item = BatchItem(obj['kind'], dict(metadata=obj.get('metadata'), spec=obj.get('spec'), file=path))
+                if not item.key[2]:
+                    raise F5ModuleError("{0}: {1} object without metadata.name".format(path, item.key[0]))
+                if item.key in items:
+                    raise F5ModuleError("{0}: {1} is also described in {2}".format(
+                        path, '/'.join(item.key), items[item.key].params['file']))
+                items[item.key] = item
+        return items
+
+    def exec_module(self):
+        start = time.time()
+        desired = self.desired()
+
+        scopes = []
+        for item in desired.values():
+            if item.kind.namespaced and (item.kind, item.key[1]) not in scopes:
+                scopes.append((item.kind, item.key[1]))
+        listings = run_parallel(
+            lambda scope: list_objects(self.client, scope[0], scope[1], full=True), scopes, self.params['parallelism']
+        )
+        live = {}
+        for (kind, namespace), (listing, error) in zip(scopes, listings):
+            if error is not None:
+                raise error
+            for obj in listing:
+                if obj.get('owner_view'):
+                    continue
+                key = (kind.kind, obj.get('namespace') or namespace, obj.get('name'))
+                live[key] = listed_object(obj, namespace)
+
+        changed = []
+        missing = set(key for key, item in desired.items() if item.kind.namespaced and key not in live)
+        unchanged = 0
+        errors = []
+
+        def compare(item, obj):
+            paths = changed_paths(comparable(obj), comparable(item.params))
+            if paths:
+                changed.append(dict(key='/'.join(item.key), file=item.params['file'], paths=paths))
+            return not paths
+
+        to_fetch = []
+        for key, item in desired.items():
+            if live.get(key) is not None:
+                unchanged += compare(item, live[key])
+            elif key in live or not item.kind.namespaced:
+                to_fetch.append(item)
+        fetched = imap_unordered(lambda item: fetch_object(self.client, item), to_fetch, self.params['parallelism'])
+        for item, obj, error in fetched:
+            if error is not None:
+                errors.append('{0}: {1}'.format('/'.join(item.key), error))
+            elif obj is None:
+                missing.add(item.key)
+            else:
+                unchanged += compare(item, obj)
+        if errors:
+            raise F5ModuleError("Drift report failed, {0}".format('; '.join(errors)))
+
+        result = dict(
+            changed=False,
+            missing=sorted('/'.join(key) for key in missing),
+            changed_objects=sorted(changed, key=lambda entry: entry['key']),
+            unchanged=unchanged,
+        )
+        if self.params['extra']:
+            result.update(extra=sorted('/'.join(key) for key in live if key not in desired))
+        result.update(elapsed=round(time.time() - start, 3))
+        if self.params['dest'] and not self.module.check_mode:
+            with open(self.params['dest'], 'w') as f:
+                json.dump(dict((k, v) for k, v in result.items() if k != 'changed'), f, indent=2, sort_keys=True)
+        return result
+
+
+class ArgumentSpec(object):
+    def __init__(self):
+        self.supports_check_mode = True
+        argument_spec = dict(
+            src=dict(type='path', required=True),
+            dest=dict(type='path'),
+            extra=dict(type='bool', default=True),
+            parallelism=dict(type='int', default=8),
+        )
+        self.argument_spec = {}
+        self.argument_spec.update(f5_argument_spec)
+        self.argument_spec.update(argument_spec)
+
+
+def main():
+    spec = ArgumentSpec()
+
+    module = AnsibleModule(
+        argument_spec=spec.argument_spec,
+        supports_check_mode=spec.supports_check_mode
+    )
+    if not HAS_YAML:
+        module.fail_json(msg=missing_required_lib('PyYAML'))
+    try:
+        mm = ModuleManager(module=module)
+        results = mm.exec_module()
+        module.exit_json(**results)
+    except (F5ModuleError, ValueError, yaml.YAMLError) as ex:
+        module.fail_json(msg=str(ex))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,199 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# GNU General Public License v3.0 (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+DOCUMENTATION = r'''
+---
+module: xc_export
+short_description: Export configuration objects to a newline-delimited JSON file
+description:
+    - Lists the objects of the given kinds in every namespace (or the given ones), fetches them concurrently
+      and writes each one as a line of JSON to C(dest) as soon as it arrives.
+    - Only a bounded number of objects is held in memory at any time, whatever the size of the tenant.
+    - Each line holds C(kind), C(metadata), C(spec) and C(system_metadata) of one object.
+      Namespaces are exported as objects of kind C(namespace).
+version_added: "0.0.7"
+options:
+    dest:
+        description:
+            - File to write. It is replaced only once the export is complete.
+        type: path
+        required: True
+    compress:
+        description:
+            - Gzip the file. Defaults to True when C(dest) ends with C(.gz).
+        type: bool
+    namespaces:
+        description:
+            - Namespaces to export. Defaults to every namespace of the tenant.
+        type: list
+        elements: str
+    kinds:
+        description:
+            - Kinds to export. Defaults to every kind known to the collection.
+        type: list
+        elements: str
+    selector:
+        description:
+            - Only export objects carrying all of these labels.
+        type: dict
+    parallelism:
+        description:
+            - Maximum number of objects fetched at the same time, and of open connections.
+        type: int
+        default: 8
+notes:
+    - Objects owned by other objects (created by a view) are not exported, they are recreated by their owner.
+    - Stored objects are not exported.
+'''
+
+EXAMPLES = r'''
+---
+- name: Nightly backup
+  hosts: webservers
+  collections:
+    - yoctoalex.xc_cloud_modules
+  connection: local
+
+  environment:
+    XC_API_TOKEN: "your_api_token"
+    XC_TENANT: "console.ves.volterra.io"
+
+  tasks:
+    - name: export every namespace
+      xc_export:
+        dest: "/backups/tenant-{{ ansible_date_time.date }}.ndjson.gz"
+        parallelism: 16
+      register: export
+
+    - debug:
+        msg: "{{ export.objects }} objects at {{ export.objects_per_second }}/s"
+'''
+
+RETURN = r'''
+---
+dest:
+    description:
+        - Path of the written file.
+    returned: always
+    type: str
+objects:
+    description:
+        - Number of objects written.
+    returned: always
+    type: int
+bytes:
+    description:
+        - Size of the exported JSON before compression.
+    returned: always
+    type: int
+elapsed:
+    description:
+        - Wall clock seconds for the export.
+    returned: always
+    type: float
+objects_per_second:
+    description:
+        - Objects written per second.
+    returned: always
+    type: float
+'''
+
+import time
+
+from ansible.module_utils.basic import AnsibleModule
+
+from ..module_utils.batch import fetch_object, inventory
+from ..module_utils.client import XcRestClient
+from ..module_utils.common import F5ModuleError, f5_argument_spec
+from ..module_utils.concurrency import imap_unordered
+from ..module_utils.ndjson import RecordWriter
+
+
+def export_record(item, obj):
+    return dict(
+        kind=item.key[0],
+        metadata=obj.get('metadata'),
+        spec=obj.get('spec'),
+        system_metadata=obj.get('system_metadata'),
+    )
+
+
+class ModuleManager(object):
+    def __init__(self, *args, **kwargs):
+        self.module = kwargs.get('module', None)
+        self.params = self.module.params
+        self.client = XcRestClient(provider=self.params['provider'], pool_size=self.params['parallelism'])
+
+    def exec_module(self):
+        start = time.time()
+        items = inventory(
+            self.client, self.params['namespaces'], self.params['kinds'], self.params['selector'],
+            self.params['parallelism'],
+        )
+        writer = RecordWriter(self.params['dest'], self.params['compress'])
+        errors = []
+        try:
+            fetched = imap_unordered(
+                lambda item: fetch_object(self.client, item), items, self.params['parallelism']
+            )
+            for item, obj, error in fetched:
+                if error is not None:
+                    errors.append('{0} {1}: {2}'.format(item.key[0], item.key[2], error))
+                elif obj is not None:
+                    writer.write(export_record(item, obj))
+        except BaseException:
+            writer.abort()
+            raise
+        if errors:
+            writer.abort()
+            raise F5ModuleError("Export failed, {0}".format('; '.join(errors)))
+        writer.close()
+        elapsed = time.time() - start
+        return dict(
+            changed=True,
+            dest=self.params['dest'],
+            objects=writer.records,
+            bytes=writer.bytes,
+            elapsed=round(elapsed, 3),
+            objects_per_second=round(writer.records / elapsed, 1) if elapsed else float(writer.records),
+        )
+
+
+class ArgumentSpec(object):
+    def __init__(self):
+        self.supports_check_mode = False
+        argument_spec = dict(
+            dest=dict(type='path', required=True),
+            compress=dict(type='bool'),
+            namespaces=dict(type='list', elements='str'),
+            kinds=dict(type='list', elements='str'),
+            selector=dict(type='dict'),
+            parallelism=dict(type='int', default=8),
+        )
+        self.argument_spec = {}
+        self.argument_spec.update(f5_argument_spec)
+        self.argument_spec.update(argument_spec)
+
+
+def main():
+    spec = ArgumentSpec()
+
+    module = AnsibleModule(
+        argument_spec=spec.argument_spec,
+        supports_check_mode=spec.supports_check_mode
+    )
+    try:
+        mm = ModuleManager(module=module)
+        results = mm.exec_module()
+        module.exit_json(**results)
+    except F5ModuleError as ex:
+        module.fail_json(msg=str(ex))
+
+
+if __name__ == '__main__':
+    main()
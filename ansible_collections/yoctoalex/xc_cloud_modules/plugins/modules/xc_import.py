@@ -0,0 +1,271 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# GNU General Public License v3.0 (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+DOCUMENTATION = r'''
+---
+module: xc_import
+short_description: Import configuration objects from a newline-delimited JSON file
+description:
+    - Creates or updates the objects of a file written by M(yoctoalex.xc_cloud_modules.xc_export).
+    - Objects are applied in tiers so that referenced objects exist first, namespaces first, then health checks,
+      API definitions, origin pools, policies and firewalls, and load balancers last.
+      The objects of a tier are applied concurrently.
+    - Objects that already match the file are left alone.
+    - The file is read once per tier instead of being loaded, so memory use does not grow with its size.
+version_added: "0.0.7"
+options:
+    src:
+        description:
+            - File to import, gzip compressed if its name ends with C(.gz).
+        type: path
+        required: True
+    checkpoint:
+        description:
+            - File recording the objects already imported. An interrupted import run again with the same
+              C(checkpoint) skips them. The file is removed once the import completes.
+        type: path
+    namespaces:
+        description:
+            - Only import objects of these namespaces (and these namespaces themselves).
+        type: list
+        elements: str
+    kinds:
+        description:
+            - Only import objects of these kinds.
+        type: list
+        elements: str
+    parallelism:
+        description:
+            - Maximum number of objects applied at the same time, and of open connections.
+        type: int
+        default: 8
+notes:
+    - Objects of kind C(stored_object) are skipped.
+    - When an object fails, the rest of its tier is still applied but later tiers are not.
+'''
+
+EXAMPLES = r'''
+---
+- name: Restore a tenant
+  hosts: webservers
+  collections:
+    - yoctoalex.xc_cloud_modules
+  connection: local
+
+  environment:
+    XC_API_TOKEN: "your_api_token"
+    XC_TENANT: "console.ves.volterra.io"
+
+  tasks:
+    - name: import backup into staging namespaces
+      xc_import:
+        src: "/backups/tenant-2024-01-31.ndjson.gz"
+        checkpoint: "/backups/restore.checkpoint"
+        namespaces:
+          - "staging"
+        parallelism: 16
+'''
+
+RETURN = r'''
+---
+created:
+    description:
+        - Number of objects created.
+    returned: always
+    type: int
+updated:
+    description:
+        - Number of objects updated.
+    returned: always
+    type: int
+unchanged:
+    description:
+        - Number of objects that already matched the file.
+    returned: always
+    type: int
+resumed:
+    description:
+        - Number of objects skipped because the checkpoint lists them.
+    returned: always
+    type: int
+errors:
+    description:
+        - "Objects that failed, as C(kind namespace/name: message)."
+    returned: always
+    type: list
+    elements: str
+tiers:
+    description:
+        - Kinds, number of objects and wall clock seconds per tier.
+    returned: always
+    type: list
+    elements: dict
+elapsed:
+    description:
+        - Wall clock seconds for the import.
+    returned: always
+    type: float
+'''
+
+import os
+import time
+
+from ansible.module_utils.basic import AnsibleModule
+
+from ..module_utils.batch import removal_tiers
+from ..module_utils.client import XcRestClient
+from ..module_utils.common import F5ModuleError, f5_argument_spec
+from ..module_utils.concurrency import imap_unordered
+from ..module_utils.diff import changed_paths
+from ..module_utils.graph import object_key
+from ..module_utils.kinds import get_kind
+from ..module_utils.ndjson import read_records
+from ..module_utils.resource import ConfigObjectManager
+
+
+def record_key(record):
+    return object_key(record.get('kind'), record.get('metadata'))
+
+
+class ModuleManager(object):
+    def __init__(self, *args, **kwargs):
+        self.module = kwargs.get('module', None)
+        self.params = self.module.params
+        self.client = XcRestClient(provider=self.params['provider'], pool_size=self.params['parallelism'])
+        self.tiers = removal_tiers()
+        self.last_tier = max(self.tiers.values())
+        self.done = set()
+        self.counts = dict(created=0, updated=0, unchanged=0, resumed=0)
+
+    def tier(self, record):
+        # Objects are created in the reverse of the order they are removed in.
+        return self.last_tier - self.tiers.get(record['kind'], 0)
+
+    def selected(self, record):
+        kind = record.get('kind')
+        if not kind or kind == 'stored_object' or not (record.get('metadata') or {}).get('name'):
+            return False
+        if self.params['kinds'] and kind not in self.params['kinds']:
+            return False
+        if self.params['namespaces']:
+            namespace = record['metadata']['name'] if kind == 'namespace' else record['metadata'].get('namespace')
+            if namespace not in self.params['namespaces']:
+                return False
+        return True
+
+    def records(self, tier):
+        for record in read_records(self.params['src']):
+            if self.selected(record) and self.tier(record) == tier and record_key(record) not in self.done:
+                yield record
+
+    def load_checkpoint(self):
+        path = self.params['checkpoint']
+        if path and os.path.exists(path):
+            with open(path) as f:
+                self.done = set(tuple(line.rstrip('\n').split('\t')) for line in f if line.strip())
+
+    def exec_module(self):
+        start = time.time()
+        self.load_checkpoint()
+
+        tiers = {}
+        for record in read_records(self.params['src']):
+            if not self.selected(record):
+                continue
+            if record_key(record) in self.done:
+                self.counts['resumed'] += 1
+                continue
+            kinds = tiers.setdefault(self.tier(record), set())
+            kinds.add(record['kind'])
+
+        checkpoint = open(self.params['checkpoint'], 'a') if self.params['checkpoint'] else None
+        errors = []
+        timings = []
+        try:
+            for tier in sorted(tiers):
+                tier_start = time.time()
+                applied = 0
+                for record, result, error in imap_unordered(self.apply, self.records(tier), self.params['parallelism']):
+                    key = record_key(record)
+                    if error is not None:
+                        errors.append('{0} {1}: {2}'.format(key[0], '/'.join(part for part in key[1:] if part), error))
+                        continue
+                    applied += 1
+                    self.counts[result] += 1
+                    if checkpoint:
+                        checkpoint.write('\t'.join(key) + '\n')
+                        checkpoint.flush()
+                timings.append(dict(
+                    kinds=sorted(tiers[tier]), objects=applied, seconds=round(time.time() - tier_start, 3)
+                ))
+                if errors:
+                    break
+        finally:
+            if checkpoint:
+                checkpoint.close()
+        if checkpoint and not errors:
+            os.remove(self.params['checkpoint'])
+
+        result = dict(
+            changed=bool(self.counts['created'] or self.counts['updated']),
+            errors=errors,
+            tiers=timings,
+            elapsed=round(time.time() - start, 3),
+        )
+        result.update(self.counts)
+        if errors:
+            result.update(failed=True, msg="Import failed for {0} objects".format(len(errors)))
+        return result
+
+    def apply(self, record):
+        kind = get_kind(record['kind'])
+        params = dict(state='present', metadata=record['metadata'], spec=record.get('spec') or {}, wait=True)
+        manager = ConfigObjectManager(params=params, kind=kind, client=self.client)
+        if not manager.exists():
+            manager.create()
+            return 'created'
+        if not kind.replace or not changed_paths(manager.have.to_update(), manager.want.to_update()):
+            return 'unchanged'
+        manager.update()
+        return 'updated'
+
+
+class ArgumentSpec(object):
+    def __init__(self):
+        self.supports_check_mode = False
+        argument_spec = dict(
+            src=dict(type='path', required=True),
+            checkpoint=dict(type='path'),
+            namespaces=dict(type='list', elements='str'),
+            kinds=dict(type='list', elements='str'),
+            parallelism=dict(type='int', default=8),
+        )
+        self.argument_spec = {}
+        self.argument_spec.update(f5_argument_spec)
+        self.argument_spec.update(argument_spec)
+
+
+def main():
+    spec = ArgumentSpec()
+
+    module = AnsibleModule(
+        argument_spec=spec.argument_spec,
+        supports_check_mode=spec.supports_check_mode
+    )
+    try:
+        mm = ModuleManager(module=module)
+        results = mm.exec_module()
+        if results.get('failed'):
+            module.fail_json(**results)
+        module.exit_json(**results)
+    except (F5ModuleError, ValueError) as ex:
+        module.fail_json(msg=str(ex))
+
+
+if __name__ == '__main__':
+    main()
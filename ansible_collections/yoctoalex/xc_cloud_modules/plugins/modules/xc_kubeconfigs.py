@@ -0,0 +1,349 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# GNU General Public License v3.0 (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+DOCUMENTATION = r'''
+---
+module: xc_kubeconfigs
+short_description: Issue kubeconfigs for many virtual K8s clusters at once
+description:
+    - Issues a C(KUBE_CONFIG) credential for every cluster in C(clusters) and writes the decoded
+      kubeconfig to its own file, readable by its owner only.
+    - The credentials are issued concurrently, so with C(parallelism) at least the number of clusters
+      the task takes about as long as the slowest one. Every kubeconfig is decoded and written while
+      it is received.
+version_added: "0.0.7"
+options:
+    clusters:
+        description:
+            - Virtual K8s clusters to issue kubeconfigs for.
+        type: list
+        elements: dict
+        required: True
+        suboptions:
+            virtual_k8s_name:
+                description:
+                    - Name of the virtual K8s cluster.
+                type: str
+                required: True
+            virtual_k8s_namespace:
+                description:
+                    - Namespace of the virtual K8s cluster.
+                type: str
+                required: True
+            name:
+                description:
+                    - Name of the credential. Defaults to C(virtual_k8s_name).
+                type: str
+            dest:
+                description:
+                    - File to write the kubeconfig to.
+                    - Defaults to C(<virtual_k8s_namespace>-<virtual_k8s_name>.kubeconfig) in C(dest_dir).
+                type: path
+    dest_dir:
+        description:
+            - Directory to write the kubeconfigs of clusters without C(dest) to.
+        type: path
+    namespace:
+        description:
+            - Namespace of the credentials.
+        type: str
+        default: system
+    expiration_days:
+        description:
+            - Qty of days of credential expiration.
+        type: int
+    cache:
+        description:
+            - Credential cache shared with M(yoctoalex.xc_cloud_modules.api_credentials).
+            - A kubeconfig issued earlier for the same cluster is written from the cache while it is valid
+              for more than C(renew_before) seconds, instead of issuing a new one.
+        type: path
+    renew_before:
+        description:
+            - Seconds before its expiration from which a cached kubeconfig is no longer used.
+        type: int
+        default: 3600
+    parallelism:
+        description:
+            - Maximum number of credentials issued at the same time, and of open connections.
+        type: int
+        default: 8
+'''
+
+EXAMPLES = r'''
+---
+- name: Kubeconfigs of a fleet of virtual K8s clusters
+  hosts: webservers
+  collections:
+    - yoctoalex.xc_cloud_modules
+  connection: local
+
+  environment:
+    XC_API_TOKEN: "your_api_token"
+    XC_TENANT: "console.ves.volterra.io"
+
+  tasks:
+    - name: issue kubeconfigs
+      xc_kubeconfigs:
+        clusters:
+          - virtual_k8s_name: "vk8s-eu"
+            virtual_k8s_namespace: "default"
+          - virtual_k8s_name: "vk8s-us"
+            virtual_k8s_namespace: "default"
+          - virtual_k8s_name: "vk8s-ap"
+            virtual_k8s_namespace: "default"
+        dest_dir: "~/.kube/xc"
+        expiration_days: 5
+        cache: "~/.xc/credentials.json"
+      register: kubeconfigs
+
+    - name: issue one kubeconfig to a given file
+      xc_kubeconfigs:
+        clusters:
+          - virtual_k8s_name: "vk8s"
+            virtual_k8s_namespace: "default"
+            name: "ci-vk8s"
+            dest: "/tmp/ci/kubeconfig"
+        expiration_days: 1
+'''
+
+RETURN = r'''
+---
+kubeconfigs:
+    description:
+        - Result per cluster, in the order of C(clusters).
+    returned: always
+    type: list
+    elements: dict
+    contains:
+        virtual_k8s_name:
+            description: Name of the virtual K8s cluster.
+            type: str
+        virtual_k8s_namespace:
+            description: Namespace of the virtual K8s cluster.
+            type: str
+        name:
+            description: Name of the credential.
+            type: str
+        dest:
+            description: File the kubeconfig was written to.
+            type: str
+        expiration_timestamp:
+            description: When the credential expires.
+            type: str
+        cached:
+            description: Whether the kubeconfig was taken from C(cache) rather than issued.
+            type: bool
+        changed:
+            description: Whether C(dest) was written. A kubeconfig from C(cache) equal to C(dest) is left untouched.
+            type: bool
+        failed:
+            description: Set when issuing or writing failed, with the error in C(msg).
+            type: bool
+issued:
+    description:
+        - Number of credentials issued.
+    returned: always
+    type: int
+'''
+
+import base64
+import os
+import tempfile
+import time
+
+from ansible.module_utils.basic import AnsibleModule
+
+from ..module_utils.client import XcRestClient
+from ..module_utils.common import F5ModuleError, f5_argument_spec
+from ..module_utils.concurrency import run_parallel
+from ..module_utils.credentials import CredentialCache, issue_credential, parse_timestamp, save_credential
+
+
+class ModuleManager(object):
+    def __init__(self, *args, **kwargs):
+        self.module = kwargs.get('module', None)
+        self.params = self.module.params
+        self.client = XcRestClient(provider=self.params['provider'], pool_size=self.params['parallelism'])
+        self.cache = CredentialCache(self.params['cache']) if self.params['cache'] else None
+
+    def cache_key(self, cluster):
+        # As api_credentials keys them, so both share the cache.
+        return CredentialCache.key(
+            self.client.tenant, self.params['namespace'],
+            'KUBE_CONFIG', cluster['virtual_k8s_namespace'], cluster['virtual_k8s_name'],
+            self.params['expiration_days'], None,
+        )
+
+    def targets(self):
+        result = []
+        for cluster in self.params['clusters']:
+            dest = cluster.get('dest')
+            if not dest:
+                if not self.params['dest_dir']:
+                    raise F5ModuleError("dest_dir is required unless every cluster has a dest")
+                dest = os.path.join(self.params['dest_dir'], '{0}-{1}.kubeconfig'.format(
+                    cluster['virtual_k8s_namespace'], cluster['virtual_k8s_name']
+                ))
+            result.append(dict(
+                virtual_k8s_name=cluster['virtual_k8s_name'],
+                virtual_k8s_namespace=cluster['virtual_k8s_namespace'],
+                name=cluster.get('name') or cluster['virtual_k8s_name'],
+                dest=dest,
+                expiration_timestamp=None,
+                cached=False,
+                changed=False,
+            ))
+        return result
+
+    def write(self, dest, save):
+        """Write ``dest`` with mode 0600 through a temporary file next to it; returns what ``save`` returns."""
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(dest) or '.', prefix='.' + os.path.basename(dest))
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                result = save(f)
+            os.replace(tmp, dest)
+        except Exception:
+            os.unlink(tmp)
+            raise
+        return result
+
+    def from_cache(self, target):
+        if self.cache is None:
+            return False
+        entry = self.cache.get(self.cache_key(target), self.params['renew_before'])
+        if entry is None:
+            return False
+        data = base64.b64decode(entry['data'])
+        target.update(name=entry['name'], expiration_timestamp=entry.get('expiration_timestamp'), cached=True)
+        if os.path.isfile(target['dest']):
+            with open(target['dest'], 'rb') as f:
+                if f.read() == data:
+                    return True
+        self.write(target['dest'], lambda f: f.write(data))
+        target.update(changed=True)
+        return True
+
+    def issue(self, target):
+        body = dict(
+            name=target['name'],
+            namespace=self.params['namespace'],
+            spec=dict(
+                type='KUBE_CONFIG',
+                virtual_k8s_name=target['virtual_k8s_name'],
+                virtual_k8s_namespace=target['virtual_k8s_namespace'],
+            ),
+        )
+        if self.params['expiration_days'] is not None:
+            body.update(expiration_days=self.params['expiration_days'])
+        response = issue_credential(self.client, self.params['namespace'], body, stream=True)
+        try:
+            fields = self.write(target['dest'], lambda f: save_credential(response, f))
+        finally:
+            response.close()
+        target.update(
+            name=fields.get('name') or target['name'],
+            expiration_timestamp=fields.get('expiration_timestamp'),
+            changed=True,
+        )
+
+    def process(self, target):
+        if not self.from_cache(target):
+            self.issue(target)
+
+    def remember(self, target):
+        expires = parse_timestamp(target['expiration_timestamp'])
+        if expires is None and self.params['expiration_days']:
+            expires = time.time() + self.params['expiration_days'] * 86400
+        if expires is None:
+            return False
+        with open(target['dest'], 'rb') as f:
+            data = base64.b64encode(f.read()).decode('ascii')
+        self.cache.put(self.cache_key(target), dict(
+            name=target['name'],
+            data=data,
+            expiration_timestamp=target['expiration_timestamp'],
+            expires=expires,
+        ))
+        return True
+
+    def exec_module(self):
+        targets = self.targets()
+        for target, (dummy, error) in zip(targets, run_parallel(self.process, targets, self.params['parallelism'])):
+            if error is not None:
+                target.update(failed=True, msg=str(error))
+
+        issued = [target for target in targets if not target['cached'] and not target.get('failed')]
+        if self.cache is not None and any([self.remember(target) for target in issued]):
+            try:
+                self.cache.save()
+            except F5ModuleError as ex:
+                # The kubeconfigs are written; only reusing them later is lost.
+                self.module.warn(str(ex))
+
+        failed = [target for target in targets if target.get('failed')]
+        result = dict(
+            kubeconfigs=targets,
+            issued=len(issued),
+            changed=any(target['changed'] for target in targets),
+        )
+        if failed:
+            result.update(failed=True, msg="Issuing {0} of {1} kubeconfigs failed: {2}".format(
+                len(failed), len(targets), '; '.join(
+                    '{virtual_k8s_namespace}/{virtual_k8s_name}: {msg}'.format(**target) for target in failed
+                )
+            ))
+        return result
+
+
+class ArgumentSpec(object):
+    def __init__(self):
+        self.supports_check_mode = False
+        argument_spec = dict(
+            clusters=dict(
+                type='list',
+                elements='dict',
+                required=True,
+                options=dict(
+                    virtual_k8s_name=dict(type='str', required=True),
+                    virtual_k8s_namespace=dict(type='str', required=True),
+                    name=dict(type='str'),
+                    dest=dict(type='path'),
+                ),
+            ),
+            dest_dir=dict(type='path'),
+            namespace=dict(type='str', default='system'),
+            expiration_days=dict(type='int'),
+            cache=dict(type='path'),
+            renew_before=dict(type='int', default=3600),
+            parallelism=dict(type='int', default=8),
+        )
+        self.argument_spec = {}
+        self.argument_spec.update(f5_argument_spec)
+        self.argument_spec.update(argument_spec)
+
+
+def main():
+    spec = ArgumentSpec()
+
+    module = AnsibleModule(
+        argument_spec=spec.argument_spec,
+        supports_check_mode=spec.supports_check_mode
+    )
+    try:
+        mm = ModuleManager(module=module)
+        results = mm.exec_module()
+        if results.get('failed'):
+            module.fail_json(**results)
+        module.exit_json(**results)
+    except F5ModuleError as ex:
+        module.fail_json(msg=str(ex))
+
+
+if __name__ == '__main__':
+    main()
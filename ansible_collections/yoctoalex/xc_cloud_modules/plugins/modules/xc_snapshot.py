@@ -0,0 +1,230 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# GNU General Public License v3.0 (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+DOCUMENTATION = r'''
+---
+module: xc_snapshot
+short_description: Take incremental snapshots of configuration objects
+description:
+    - Saves the configuration objects of a tenant into a snapshot store on local disk.
+    - Each object (its C(kind), C(metadata) and C(spec)) is stored once, compressed, under the sha256 of its
+      canonical JSON. A snapshot is a manifest mapping C(kind/namespace/name) to that hash, so a new snapshot
+      writes only the objects that changed since any earlier one.
+    - Objects are listed with their C(system_metadata). When its C(modification_timestamp) equals the one
+      recorded in the previous snapshot, the object is not downloaded again.
+version_added: "0.0.7"
+options:
+    path:
+        description:
+            - Directory of the snapshot store. It is created if missing.
+        type: path
+        required: True
+    name:
+        description:
+            - Name of the snapshot. Defaults to the current UTC time, e.g. C(20240131T235959Z).
+        type: str
+    namespaces:
+        description:
+            - Namespaces to include. Defaults to every namespace of the tenant.
+        type: list
+        elements: str
+    kinds:
+        description:
+            - Kinds to include. Defaults to every kind known to the collection.
+        type: list
+        elements: str
+    selector:
+        description:
+            - Only include objects carrying all of these labels.
+        type: dict
+    parallelism:
+        description:
+            - Maximum number of objects fetched at the same time, and of open connections.
+        type: int
+        default: 8
+'''
+
+EXAMPLES = r'''
+---
+- name: Hourly configuration snapshot
+  hosts: webservers
+  collections:
+    - yoctoalex.xc_cloud_modules
+  connection: local
+
+  environment:
+    XC_API_TOKEN: "your_api_token"
+    XC_TENANT: "console.ves.volterra.io"
+
+  tasks:
+    - name: take snapshot
+      xc_snapshot:
+        path: "/backups/xc-snapshots"
+      register: snapshot
+
+    - debug:
+        msg: "{{ snapshot.name }}: {{ snapshot.written }} of {{ snapshot.objects }} objects changed"
+'''
+
+RETURN = r'''
+---
+name:
+    description:
+        - Name of the snapshot.
+    returned: always
+    type: str
+manifest:
+    description:
+        - Path of the snapshot manifest.
+    returned: always
+    type: str
+objects:
+    description:
+        - Number of objects in the snapshot.
+    returned: always
+    type: int
+fetched:
+    description:
+        - Number of objects downloaded, the rest were unchanged according to their modification timestamp.
+    returned: always
+    type: int
+written:
+    description:
+        - Number of objects new to the store.
+    returned: always
+    type: int
+added:
+    description:
+        - Keys (C(kind/namespace/name)) of objects not in the previous snapshot.
+    returned: always
+    type: list
+    elements: str
+modified:
+    description:
+        - Keys of objects whose content differs from the previous snapshot.
+    returned: always
+    type: list
+    elements: str
+removed:
+    description:
+        - Keys of objects in the previous snapshot that are gone.
+    returned: always
+    type: list
+    elements: str
+elapsed:
+    description:
+        - Wall clock seconds for the snapshot.
+    returned: always
+    type: float
+'''
+
+import os
+import time
+
+from ansible.module_utils.basic import AnsibleModule
+
+from ..module_utils.batch import fetch_object, inventory
+from ..module_utils.client import XcRestClient
+from ..module_utils.common import F5ModuleError, f5_argument_spec
+from ..module_utils.concurrency import imap_unordered
+from ..module_utils.snapshot import SnapshotStore
+
+
+class ModuleManager(object):
+    def __init__(self, *args, **kwargs):
+        self.module = kwargs.get('module', None)
+        self.params = self.module.params
+        self.client = XcRestClient(provider=self.params['provider'], pool_size=self.params['parallelism'])
+        self.store = SnapshotStore(self.params['path'])
+
+    def exec_module(self):
+        start = time.time()
+        name = self.params['name'] or time.strftime('%Y%m%dT%H%M%SZ', time.gmtime())
+        previous_name = self.store.latest()
+        previous = self.store.load_manifest(previous_name) if previous_name else {}
+
+        entries = {}
+        to_fetch = []
+        items = inventory(
+            self.client, self.params['namespaces'], self.params['kinds'], self.params['selector'],
+            self.params['parallelism'], full=True,
+        )
+        for item in items:
+            key = SnapshotStore.entry_key(item.key)
+            modified = (item.params.get('system_metadata') or {}).get('modification_timestamp')
+            known = previous.get(key)
+            if modified and known and known[1] == modified:
+                entries[key] = known
+            else:
+                to_fetch.append(item)
+
+        written = 0
+        errors = []
+        fetched = imap_unordered(lambda item: fetch_object(self.client, item), to_fetch, self.params['parallelism'])
+        for item, obj, error in fetched:
+            if error is not None:
+                errors.append('{0} {1}: {2}'.format(item.key[0], item.key[2], error))
+                continue
+            if obj is None:
+                continue
+            record = dict(kind=item.key[0], metadata=obj.get('metadata'), spec=obj.get('spec'))
+            digest, new = self.store.put(record)
+            written += new
+            modified = (obj.get('system_metadata') or {}).get('modification_timestamp')
+            entries[SnapshotStore.entry_key(item.key)] = [digest, modified]
+        if errors:
+            raise F5ModuleError("Snapshot failed, {0}".format('; '.join(errors)))
+
+        self.store.save_manifest(name, entries)
+        return dict(
+            changed=True,
+            name=name,
+            manifest=os.path.join(self.store.manifests, name + '.json'),
+            objects=len(entries),
+            fetched=len(to_fetch),
+            written=written,
+            added=sorted(key for key in entries if key not in previous),
+            modified=sorted(key for key in entries if key in previous and previous[key][0] != entries[key][0]),
+            removed=sorted(key for key in previous if key not in entries),
+            elapsed=round(time.time() - start, 3),
+        )
+
+
+class ArgumentSpec(object):
+    def __init__(self):
+        self.supports_check_mode = False
+        argument_spec = dict(
+            path=dict(type='path', required=True),
+            name=dict(type='str'),
+            namespaces=dict(type='list', elements='str'),
+            kinds=dict(type='list', elements='str'),
+            selector=dict(type='dict'),
+            parallelism=dict(type='int', default=8),
+        )
+        self.argument_spec = {}
+        self.argument_spec.update(f5_argument_spec)
+        self.argument_spec.update(argument_spec)
+
+
+def main():
+    spec = ArgumentSpec()
+
+    module = AnsibleModule(
+        argument_spec=spec.argument_spec,
+        supports_check_mode=spec.supports_check_mode
+    )
+    try:
+        mm = ModuleManager(module=module)
+        results = mm.exec_module()
+        module.exit_json(**results)
+    except F5ModuleError as ex:
+        module.fail_json(msg=str(ex))
+
+
+if __name__ == '__main__':
+    main()
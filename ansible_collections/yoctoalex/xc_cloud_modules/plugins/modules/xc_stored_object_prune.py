@@ -0,0 +1,254 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# GNU General Public License v3.0 (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+DOCUMENTATION = r'''
+---
+module: xc_stored_object_prune
+short_description: Remove old versions of the stored objects of a namespace
+description:
+    - Every upload of a stored object creates a new version. This module keeps the C(keep) newest versions
+      of every stored object of a namespace, and the versions API definitions refer to in C(swagger_specs),
+      and removes the others.
+    - The versions of all objects come from one listing of the namespace, the API definitions from one
+      listing per namespace in C(reference_namespaces), and the versions are removed concurrently.
+version_added: "0.0.7"
+options:
+    namespace:
+        description:
+            - Namespace of the stored objects.
+        type: str
+        required: True
+    object_types:
+        description:
+            - Only prune objects of these types, for example C(swagger). Defaults to every type.
+        type: list
+        elements: str
+    keep:
+        description:
+            - Number of versions to keep per object, newest first. The latest version is always kept.
+        type: int
+        default: 5
+    keep_referenced:
+        description:
+            - Keep the versions referred to by the C(swagger_specs) of an API definition.
+        type: bool
+        default: True
+    reference_namespaces:
+        description:
+            - Namespaces whose API definitions are checked for references. Defaults to C(namespace).
+        type: list
+        elements: str
+    parallelism:
+        description:
+            - Maximum number of versions removed at the same time, and of open connections.
+        type: int
+        default: 8
+notes:
+    - In check mode the versions that would be removed are reported and nothing is removed.
+'''
+
+EXAMPLES = r'''
+---
+- name: Housekeeping of a CI tenant
+  hosts: webservers
+  collections:
+    - yoctoalex.xc_cloud_modules
+  connection: local
+
+  environment:
+    XC_API_TOKEN: "your_api_token"
+    XC_TENANT: "console.ves.volterra.io"
+
+  tasks:
+    - name: keep the three newest versions of every swagger file
+      xc_stored_object_prune:
+        namespace: "default"
+        object_types:
+          - swagger
+        keep: 3
+      register: pruned
+
+    - name: report
+      debug:
+        msg: "removed {{ pruned.deleted }} versions, kept {{ pruned.kept }}"
+'''
+
+RETURN = r'''
+---
+objects:
+    description:
+        - Result per stored object.
+    returned: always
+    type: list
+    elements: dict
+    contains:
+        object_type:
+            description: Type of the object.
+            type: str
+        name:
+            description: Name of the object.
+            type: str
+        kept:
+            description: Versions kept, newest first.
+            type: list
+            elements: str
+        deleted:
+            description: Versions removed, or to be removed in check mode.
+            type: list
+            elements: str
+        failed:
+            description: Versions that could not be removed, with the error.
+            type: list
+            elements: dict
+kept:
+    description:
+        - Number of versions kept.
+    returned: always
+    type: int
+deleted:
+    description:
+        - Number of versions removed.
+    returned: always
+    type: int
+'''
+
+from ansible.module_utils.basic import AnsibleModule
+
+from ..module_utils.batch import BatchItem, fetch_object, list_objects
+from ..module_utils.client import XcRestClient
+from ..module_utils.common import F5ModuleError, f5_argument_spec
+from ..module_utils.concurrency import run_parallel
+from ..module_utils.kinds import get_kind
+from ..module_utils.object_store import list_stored_objects, object_uri, parse_object_url
+
+
+class ModuleManager(object):
+    def __init__(self, *args, **kwargs):
+        self.module = kwargs.get('module', None)
+        self.params = self.module.params
+        self.client = XcRestClient(provider=self.params['provider'], pool_size=self.params['parallelism'])
+
+    def api_definitions(self, namespaces):
+        kind = get_kind('api_definition')
+        workers = self.params['parallelism']
+        listings = run_parallel(
+            lambda namespace: list_objects(self.client, kind, namespace, full=True), namespaces, workers
+        )
+        to_fetch = []
+        for namespace, (listing, error) in zip(namespaces, listings):
+            if error is not None:
+                raise error
+            for obj in listing:
+                if obj.get('get_spec') is None:
+                    metadata = dict(namespace=obj.get('namespace') or namespace, name=obj.get('name'))
+                    to_fetch.append(BatchItem(kind, dict(metadata=metadata)))
+                else:
+                    yield obj['get_spec']
+        for obj, error in run_parallel(lambda item: fetch_object(self.client, item), to_fetch, workers):
+            if error is not None:
+                raise error
+            if obj is not None:
+                yield obj.get('spec') or {}
+
+    def referenced_versions(self):
+        """``(object_type, name, version)`` of the versions API definitions refer to."""
+        namespace = self.params['namespace']
+        result = set()
+        for spec in self.api_definitions(self.params['reference_namespaces'] or [namespace]):
+            for url in spec.get('swagger_specs') or []:
+                parsed = parse_object_url(url)
+                if parsed and parsed[0] == namespace:
+                    result.add(parsed[1:])
+        return result
+
+    def plan(self):
+        referenced = self.referenced_versions() if self.params['keep_referenced'] else set()
+        object_types = self.params['object_types']
+        plans = []
+        for obj in list_stored_objects(self.client, self.params['namespace']):
+            object_type, name = obj.get('object_type'), obj.get('name')
+            if object_types and object_type not in object_types:
+                continue
+            versions = sorted(obj.get('versions') or [], key=lambda v: v.get('creation_timestamp') or '', reverse=True)
+            kept, deleted = [], []
+            for n, version in enumerate(versions):
+                if n < self.params['keep'] or version.get('latest_version') or \
+                        (object_type, name, version.get('version')) in referenced:
+                    kept.append(version.get('version'))
+                else:
+                    deleted.append(version.get('version'))
+            plans.append(dict(object_type=object_type, name=name, kept=kept, deleted=deleted, failed=[]))
+        return plans
+
+    def remove(self, task):
+        plan, version = task
+        uri = object_uri(self.params['namespace'], plan['object_type'], plan['name'], version)
+        response = self.client.api.delete(url=uri)
+        if response.status not in [200, 201, 202, 404]:
+            raise F5ModuleError(response.content)
+
+    def exec_module(self):
+        if self.params['keep'] < 1:
+            raise F5ModuleError("keep must be at least 1")
+        plans = self.plan()
+        tasks = [(plan, version) for plan in plans for version in plan['deleted']]
+        if not self.module.check_mode:
+            results = run_parallel(self.remove, tasks, self.params['parallelism'])
+            for (plan, version), (dummy, error) in zip(tasks, results):
+                if error is not None:
+                    plan['deleted'].remove(version)
+                    plan['failed'].append(dict(version=version, msg=str(error)))
+
+        result = dict(
+            objects=plans,
+            kept=sum(len(plan['kept']) for plan in plans),
+            deleted=sum(len(plan['deleted']) for plan in plans),
+        )
+        result.update(changed=result['deleted'] > 0)
+        errors = ['{0}/{1} {2}: {3}'.format(plan['object_type'], plan['name'], failure['version'], failure['msg'])
+                  for plan in plans for failure in plan['failed']]
+        if errors:
+            result.update(failed=True, msg="Removing stored object versions failed: {0}".format('; '.join(errors)))
+        return result
+
+
+class ArgumentSpec(object):
+    def __init__(self):
+        self.supports_check_mode = True
+        argument_spec = dict(
+            namespace=dict(type='str', required=True),
+            object_types=dict(type='list', elements='str'),
+            keep=dict(type='int', default=5),
+            keep_referenced=dict(type='bool', default=True),
+            reference_namespaces=dict(type='list', elements='str'),
+            parallelism=dict(type='int', default=8),
+        )
+        self.argument_spec = {}
+        self.argument_spec.update(f5_argument_spec)
+        self.argument_spec.update(argument_spec)
+
+
+def main():
+    spec = ArgumentSpec()
+
+    module = AnsibleModule(
+        argument_spec=spec.argument_spec,
+        supports_check_mode=spec.supports_check_mode
+    )
+    try:
+        mm = ModuleManager(module=module)
+        results = mm.exec_module()
+        if results.get('failed'):
+            module.fail_json(**results)
+        module.exit_json(**results)
+    except F5ModuleError as ex:
+        module.fail_json(msg=str(ex))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,245 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# GNU General Public License v3.0 (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+DOCUMENTATION = r'''
+---
+module: xc_teardown
+short_description: Remove the objects of a namespace in dependency order
+description:
+    - Removes every object of the given kinds from a namespace, and optionally the namespace itself.
+    - Objects are removed in tiers so that nothing is removed while another object still refers to it,
+      load balancers first, then service policies, app firewalls, origin pools and API definitions,
+      then health checks and stored objects, and the namespace last.
+    - The objects of a tier are removed concurrently, and with C(wait) the next tier starts only once
+      the API no longer lists them.
+version_added: "0.0.7"
+options:
+    namespace:
+        description:
+            - Namespace to clean up.
+        type: str
+        required: True
+    kinds:
+        description:
+            - Kinds to remove. Defaults to every kind known to the collection, including C(stored_object).
+            - Objects are removed in the order the references between known kinds require. The references of
+              other kinds are not known, so their objects are removed first, together with the load balancers.
+        type: list
+        elements: str
+    selector:
+        description:
+            - Only remove objects carrying all of these labels.
+            - Stored objects carry no labels and are skipped when a selector is given.
+        type: dict
+    delete_namespace:
+        description:
+            - Remove the namespace itself once its objects are gone.
+        type: bool
+        default: False
+    wait:
+        description:
+            - Wait for each tier to disappear before removing the next one.
+        type: bool
+        default: True
+    timeout:
+        description:
+            - Seconds to wait for one tier to disappear.
+        type: int
+        default: 900
+    parallelism:
+        description:
+            - Maximum number of objects removed at the same time, and of open connections.
+        type: int
+        default: 8
+notes:
+    - Objects owned by other objects (created by a view) are removed along with their owner and are not listed.
+'''
+
+EXAMPLES = r'''
+---
+- name: Recycle a CI environment
+  hosts: webservers
+  collections:
+    - yoctoalex.xc_cloud_modules
+  connection: local
+
+  environment:
+    XC_API_TOKEN: "your_api_token"
+    XC_TENANT: "console.ves.volterra.io"
+
+  tasks:
+    - name: remove everything in the namespace and the namespace itself
+      xc_teardown:
+        namespace: "ci-1234"
+        delete_namespace: True
+
+    - name: remove load balancers and pools of one app
+      xc_teardown:
+        namespace: "default"
+        kinds:
+          - http_loadbalancer
+          - origin_pool
+        selector:
+          app: "demo"
+'''
+
+RETURN = r'''
+---
+objects:
+    description:
+        - Result per object, in the order they were removed.
+    returned: always
+    type: list
+    elements: dict
+    contains:
+        kind:
+            description: Kind of the object.
+            type: str
+        namespace:
+            description: Namespace of the object.
+            type: str
+        name:
+            description: Name of the object.
+            type: str
+        level:
+            description: Tier the object was removed in, starting at 0.
+            type: int
+        changed:
+            description: Whether the object was removed.
+            type: bool
+        failed:
+            description: Set when removing the object failed, with the error in C(msg).
+            type: bool
+levels:
+    description:
+        - Number of objects and wall clock seconds per tier, including the wait for removal.
+    returned: always
+    type: list
+    elements: dict
+elapsed:
+    description:
+        - Wall clock seconds for the whole teardown.
+    returned: always
+    type: float
+'''
+
+import time
+
+from ansible.module_utils.basic import AnsibleModule
+
+from ..module_utils.batch import BatchItem, list_objects, live_items, removal_levels, run_levels, wait_removed
+from ..module_utils.client import XcRestClient
+from ..module_utils.common import F5ModuleError, f5_argument_spec
+from ..module_utils.kinds import KINDS, get_kind
+from ..module_utils.object_store import list_stored_objects, object_uri
+from ..module_utils.resource import ConfigObjectManager
+
+
+def list_any(client, kind, namespace):
+    if kind.kind == 'stored_object':
+        return list_stored_objects(client, namespace)
+    return list_objects(client, kind, namespace)
+
+
+class ModuleManager(object):
+    def __init__(self, *args, **kwargs):
+        self.module = kwargs.get('module', None)
+        self.params = self.module.params
+        self.client = XcRestClient(provider=self.params['provider'], pool_size=self.params['parallelism'])
+
+    def exec_module(self):
+        start = time.time()
+        namespace = self.params['namespace']
+        kinds = self.params['kinds'] or [kind for kind in KINDS if KINDS[kind].namespaced] + ['stored_object']
+        scopes = []
+        for name in kinds:
+            kind = get_kind(name)
+            if kind.namespaced and name != 'stored_object':
+                scopes.append((kind, namespace))
+
+        items = live_items(self.client, scopes, self.params['selector'], self.params['parallelism'])
+        if 'stored_object' in kinds and not self.params['selector']:
+            items.extend(self.stored_objects(namespace))
+        if self.params['delete_namespace']:
+            items.append(BatchItem(KINDS['namespace'], dict(state='absent', metadata=dict(name=namespace))))
+
+        settle = self.settle if self.params['wait'] else None
+        results, timings, failed = run_levels(removal_levels(items), self.remove, self.params['parallelism'], settle)
+        result = dict(
+            objects=results,
+            levels=timings,
+            changed=any(entry['changed'] for entry in results),
+            elapsed=round(time.time() - start, 3),
+        )
+        if failed:
+            errors = ['{kind} {name}: {msg}'.format(**entry) for entry in results if entry.get('failed')]
+            errors.extend(timing['msg'] for timing in timings if timing.get('failed'))
+            result.update(failed=True, msg="Teardown of {0} failed: {1}".format(namespace, '; '.join(errors)))
+        return result
+
+    def stored_objects(self, namespace):
+        kind = get_kind('stored_object')
+        return [
+            BatchItem(kind, dict(
+                state='absent',
+                metadata=dict(namespace=namespace, name=obj.get('name')),
+                object_type=obj.get('object_type'),
+            ))
+            for obj in list_stored_objects(self.client, namespace)
+        ]
+
+    def remove(self, item):
+        if item.key[0] != 'stored_object':
+            return dict(changed=ConfigObjectManager(params=item.params, kind=item.kind, client=self.client).remove())
+        response = self.client.api.delete(url=object_uri(item.key[1], item.params['object_type'], item.key[2]))
+        if response.status == 404:
+            return dict(changed=False)
+        if response.status not in [200, 201, 202]:
+            raise F5ModuleError(response.content)
+        return dict(changed=True)
+
+    def settle(self, items):
+        wait_removed(self.client, items, self.params['timeout'], self.params['parallelism'], lister=list_any)
+
+
+class ArgumentSpec(object):
+    def __init__(self):
+        self.supports_check_mode = False
+        argument_spec = dict(
+            namespace=dict(type='str', required=True),
+            kinds=dict(type='list', elements='str'),
+            selector=dict(type='dict'),
+            delete_namespace=dict(type='bool', default=False),
+            wait=dict(type='bool', default=True),
+            timeout=dict(type='int', default=900),
+            parallelism=dict(type='int', default=8),
+        )
+        self.argument_spec = {}
+        self.argument_spec.update(f5_argument_spec)
+        self.argument_spec.update(argument_spec)
+
+
+def main():
+    spec = ArgumentSpec()
+
+    module = AnsibleModule(
+        argument_spec=spec.argument_spec,
+        supports_check_mode=spec.supports_check_mode
+    )
+    try:
+        mm = ModuleManager(module=module)
+        results = mm.exec_module()
+        if results.get('failed'):
+            module.fail_json(**results)
+        module.exit_json(**results)
+    except F5ModuleError as ex:
+        module.fail_json(msg=str(ex))
+
+
+if __name__ == '__main__':
+    main()
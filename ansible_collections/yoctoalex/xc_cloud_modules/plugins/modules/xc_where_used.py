@@ -0,0 +1,270 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# GNU General Public License v3.0 (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+DOCUMENTATION = r'''
+---
+module: xc_where_used
+short_description: Find the objects referring to origin pools, firewalls, policies and other objects
+description:
+    - Builds an index of the references between objects and answers, for each of C(targets),
+      which objects refer to it.
+    - Every kind that can refer to other objects (load balancers, origin pools, API definitions,
+      service policy sets) is listed once per namespace, with the object specifications included,
+      so the index costs one request per kind and namespace.
+    - References are the C(namespace)/C(name) pairs found in fields such as C(default_route_pools), C(origin_pools),
+      C(app_firewall), C(active_service_policies), C(healthcheck) and C(swagger_specs).
+version_added: "0.0.7"
+options:
+    targets:
+        description:
+            - Objects to look up.
+        type: list
+        elements: dict
+        required: True
+        suboptions:
+            kind:
+                description:
+                    - Kind of the object, for example C(origin_pool), C(app_firewall) or C(service_policy).
+                type: str
+                required: True
+            namespace:
+                description:
+                    - Namespace of the object.
+                type: str
+                required: True
+            name:
+                description:
+                    - Name of the object.
+                type: str
+                required: True
+    namespaces:
+        description:
+            - Namespaces whose objects are indexed. Defaults to every namespace of the tenant.
+        type: list
+        elements: str
+    cache:
+        description:
+            - File to keep the index in. An index built for the same tenant and namespaces less than
+              C(cache_ttl) seconds ago is used instead of listing the objects again.
+            - In check mode the cache is read but not written.
+        type: path
+    cache_ttl:
+        description:
+            - Seconds a cached index stays valid.
+        type: int
+        default: 300
+    parallelism:
+        description:
+            - Maximum number of requests at the same time, and of open connections.
+        type: int
+        default: 8
+'''
+
+EXAMPLES = r'''
+---
+- name: Check what uses an origin pool before removing it
+  hosts: webservers
+  collections:
+    - yoctoalex.xc_cloud_modules
+  connection: local
+
+  environment:
+    XC_API_TOKEN: "your_api_token"
+    XC_TENANT: "console.ves.volterra.io"
+
+  tasks:
+    - name: find referring objects
+      xc_where_used:
+        namespaces:
+          - "default"
+          - "shared"
+        targets:
+          - kind: origin_pool
+            namespace: "default"
+            name: "demo-pool"
+          - kind: app_firewall
+            namespace: "shared"
+            name: "demo-fw"
+        cache: "/tmp/xc-where-used.json"
+      register: usage
+
+    - name: delete the pool when nothing uses it
+      origin_pool:
+        state: absent
+        metadata:
+          namespace: "default"
+          name: "demo-pool"
+      when: usage.targets[0].used_by | length == 0
+'''
+
+RETURN = r'''
+---
+targets:
+    description:
+        - The C(targets), each with a C(used_by) list of the objects referring to it.
+    returned: always
+    type: list
+    elements: dict
+    sample:
+        - kind: "origin_pool"
+          namespace: "default"
+          name: "demo-pool"
+          used_by:
+            - kind: "http_loadbalancer"
+              namespace: "default"
+              name: "demo-http-lb"
+cached:
+    description:
+        - Whether the index was read from C(cache).
+    returned: always
+    type: bool
+objects:
+    description:
+        - Number of referring objects indexed.
+    returned: when the index was built
+    type: int
+'''
+
+import json
+import os
+import tempfile
+import time
+
+from ansible.module_utils.basic import AnsibleModule
+
+from ..module_utils.batch import BatchItem, fetch_object, list_namespaces, list_objects
+from ..module_utils.client import XcRestClient
+from ..module_utils.common import F5ModuleError, f5_argument_spec
+from ..module_utils.concurrency import imap_unordered, run_parallel
+from ..module_utils.graph import reverse_index
+from ..module_utils.kinds import KINDS
+
+
+class ModuleManager(object):
+    def __init__(self, *args, **kwargs):
+        self.module = kwargs.get('module', None)
+        self.params = self.module.params
+        self.client = XcRestClient(provider=self.params['provider'], pool_size=self.params['parallelism'])
+        self.indexed = 0
+
+    def load_cache(self, namespaces):
+        path = self.params['cache']
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            with open(path) as f:
+                cache = json.load(f)
+        except ValueError:
+            return None
+        if cache.get('tenant') != self.client.tenant or cache.get('namespaces') != namespaces:
+            return None
+        if time.time() - cache.get('built', 0) > self.params['cache_ttl']:
+            return None
+        return dict((tuple(ref), [tuple(user) for user in users]) for ref, users in cache['index'])
+
+    def save_cache(self, namespaces, index):
+        path = self.params['cache']
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or '.', prefix='.' + os.path.basename(path))
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(dict(
+                    built=time.time(), tenant=self.client.tenant, namespaces=namespaces, index=list(index.items())
+                ), f)
+            os.replace(tmp, path)
+        except Exception:
+            os.unlink(tmp)
+            raise
+
+    def referring_objects(self, namespaces):
+        scopes = [(kind, namespace) for kind in KINDS.values() if kind.references for namespace in namespaces]
+        listings = run_parallel(
+            lambda scope: list_objects(self.client, scope[0], scope[1], full=True), scopes, self.params['parallelism']
+        )
+        to_fetch = []
+        for (kind, namespace), (listing, error) in zip(scopes, listings):
+            if error is not None:
+                raise error
+            for obj in listing:
+                metadata = dict(namespace=obj.get('namespace') or namespace, name=obj.get('name'))
+                if obj.get('get_spec') is None:
+                    to_fetch.append(BatchItem(kind, dict(metadata=metadata)))
+                    continue
+                self.indexed += 1
+                yield kind, dict(metadata=metadata, spec=obj['get_spec'])
+        fetched = imap_unordered(lambda item: fetch_object(self.client, item), to_fetch, self.params['parallelism'])
+        for item, obj, error in fetched:
+            if error is not None:
+                raise error
+            if obj is not None:
+                self.indexed += 1
+                yield item.kind, obj
+
+    def exec_module(self):
+        namespaces = sorted(self.params['namespaces'] or list_namespaces(self.client))
+        index = self.load_cache(namespaces)
+        cached = index is not None
+        if not cached:
+            index = reverse_index(self.referring_objects(namespaces))
+            if self.params['cache'] and not self.module.check_mode:
+                self.save_cache(namespaces, index)
+
+        targets = []
+        for target in self.params['targets']:
+            users = index.get((target['kind'], target['namespace'], target['name']), [])
+            result = dict(target)
+            result.update(used_by=[
+                dict(kind=kind, namespace=namespace or None, name=name) for kind, namespace, name in users
+            ])
+            targets.append(result)
+        result = dict(changed=False, targets=targets, cached=cached)
+        if not cached:
+            result.update(objects=self.indexed)
+        return result
+
+
+class ArgumentSpec(object):
+    def __init__(self):
+        self.supports_check_mode = True
+        argument_spec = dict(
+            targets=dict(
+                type='list',
+                elements='dict',
+                required=True,
+                options=dict(
+                    kind=dict(type='str', required=True),
+                    namespace=dict(type='str', required=True),
+                    name=dict(type='str', required=True),
+                ),
+            ),
+            namespaces=dict(type='list', elements='str'),
+            cache=dict(type='path'),
+            cache_ttl=dict(type='int', default=300),
+            parallelism=dict(type='int', default=8),
+        )
+        self.argument_spec = {}
+        self.argument_spec.update(f5_argument_spec)
+        self.argument_spec.update(argument_spec)
+
+
+def main():
+    spec = ArgumentSpec()
+
+    module = AnsibleModule(
+        argument_spec=spec.argument_spec,
+        supports_check_mode=spec.supports_check_mode
+    )
+    try:
+        mm = ModuleManager(module=module)
+        results = mm.exec_module()
+        module.exit_json(**results)
+    except F5ModuleError as ex:
+        module.fail_json(msg=str(ex))
+
+
+if __name__ == '__main__':
+    main()
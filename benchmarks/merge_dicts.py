@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# GNU General Public License v3.0 (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+"""Benchmark ``patch`` merging on a ~5 MB http_loadbalancer spec.
+
+Compares the shared ``module_utils.merge.merge_dicts`` with the recursive
+generator the modules used to carry. Run from the repository root:
+
+    python benchmarks/merge_dicts.py
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from ansible_collections.yoctoalex.xc_cloud_modules.plugins.module_utils.merge import merge_dicts  # noqa: E402
+
+
+def legacy_merge_dicts(dict1, dict2):
+    for k in set(dict1.keys()).union(dict2.keys()):
+        if k in dict1 and k in dict2:
+            if isinstance(dict1[k], dict) and isinstance(dict2[k], dict):
+                yield k, dict(legacy_merge_dicts(dict1[k], dict2[k]))
+            elif dict2[k] is None:
+                pass
+            else:
+                yield k, dict2[k]
+        elif k in dict1:
+            if dict1[k] is None:
+                pass
+            else:
+                yield k, dict1[k]
+        else:
+            if dict2[k] is None:
+                pass
+            else:
+                yield k, dict2[k]
+
+
+def build_spec(routes=16000, pools=1000):
+    return {
+        'metadata': {'name': 'bench-lb', 'namespace': 'default', 'labels': {'env': 'bench'}},
+        'spec': {
+            'domains': ['bench.example.com'],
+            'http': {'port': 80},
+            'disable_waf': {},
+            'default_route_pools': [
+                {
+                    'pool': {'tenant': 'acme', 'namespace': 'default', 'name': 'pool-%d' % i},
+                    'weight': 1,
+                    'priority': 1,
+                }
+                for i in range(pools)
+            ],
+            'routes': [
+                {
+                    'simple_route': {
+                        'http_method': 'ANY',
+                        'path': {'prefix': '/api/v1/resource-%d' % i},
+                        'headers': [{'name': 'x-route', 'exact': 'r%d' % i}],
+                        'origin_pools': [
+                            {'pool': {'tenant': 'acme', 'namespace': 'default', 'name': 'pool-%d' % (i % pools)}}
+                        ],
+                        'advanced_options': {'timeout': 3000, 'retry_policy': {'num_retries': 3}},
+                    }
+                }
+                for i in range(routes)
+            ],
+        },
+    }
+
+
+def main():
+    have = build_spec()
+    want = {
+        'metadata': {'name': 'bench-lb', 'namespace': 'default'},
+        'spec': {
+            'disable_waf': None,
+            'app_firewall': {'tenant': 'acme', 'namespace': 'default', 'name': 'fw'},
+            'default_route_pools': [
+                {'pool': {'namespace': 'default', 'name': 'pool-7'}, 'weight': 5},
+                {'pool': {'namespace': 'default', 'name': 'pool-8'}, 'state': 'absent'},
+                {'pool': {'tenant': 'acme', 'namespace': 'default', 'name': 'pool-new'}, 'weight': 1},
+            ],
+        },
+    }
+    size = len(json.dumps(have))
+
+    full = json.loads(json.dumps(have))
+
+    encode = min(timeit.repeat(lambda: json.dumps(have), number=5, repeat=3)) / 5
+    print('spec size        : %.1f MB' % (size / 1024.0 / 1024.0))
+    print('json.dumps       : %.3f ms (reference: cost of sending the spec)' % (encode * 1000))
+    for label, changes in (('small patch', want), ('full spec', full)):
+        legacy = min(timeit.repeat(lambda: dict(legacy_merge_dicts(have, changes)), number=5, repeat=3)) / 5
+        shared = min(timeit.repeat(lambda: merge_dicts(have, changes), number=5, repeat=3)) / 5
+        print('%-12s legacy recursive : %8.3f ms' % (label, legacy * 1000))
+        print('%-12s merge_dicts      : %8.3f ms' % (label, shared * 1000))
+
+    merged = merge_dicts(have, want)
+    assert merged['spec']['routes'] is have['spec']['routes']
+    pools = merged['spec']['default_route_pools']
+    assert len(pools) == len(have['spec']['default_route_pools'])
+    assert pools[7]['weight'] == 5 and pools[-1]['pool']['name'] == 'pool-new'
+    assert 'pool-8' not in [pool['pool']['name'] for pool in pools]
+    assert 'disable_waf' not in merged['spec']
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# GNU General Public License v3.0 (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+"""Per-module AnsiballZ payload size and startup compile time.
+
+AnsiballZ ships each module together with every collection module_utils file
+it imports (transitively), deflated into a zip, and the target compiles all of
+it from source on every task. This script reproduces that part of the payload
+for each module in the collection and reports:
+
+* own   - bytes of the module file itself
+* raw   - bytes of Python source shipped for the collection
+* zip   - the same, deflated (what ends up base64-encoded in the task)
+* compile - time to compile the files imported when the module starts, i.e.
+  per-task startup cost. AnsiballZ also ships files imported inside
+  functions, but they are only compiled when that code runs.
+
+Run from the repository root:
+
+    python benchmarks/module_payload.py
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import os
+import re
+import timeit
+import zlib
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..',
+                    'ansible_collections', 'yoctoalex', 'xc_cloud_modules', 'plugins')
+IMPORT_RE = re.compile(r'^\s*from \.\.module_utils\.(\w+) import', re.MULTILINE)
+EAGER_IMPORT_RE = re.compile(r'^from \.\.module_utils\.(\w+) import', re.MULTILINE)
+
+
+def dependencies(path, seen=None, pattern=IMPORT_RE):
+    seen = seen if seen is not None else set()
+    if path in seen:
+        return seen
+    seen.add(path)
+    with open(path) as f:
+        source = f.read()
+    for name in pattern.findall(source):
+        dependencies(os.path.join(ROOT, 'module_utils', name + '.py'), seen, pattern)
+    return seen
+
+
+def main():
+    modules_dir = os.path.join(ROOT, 'modules')
+    print('%-24s %8s %8s %8s %10s' % ('module', 'own', 'raw', 'zip', 'compile'))
+    totals = [0, 0, 0, 0.0]
+    for name in sorted(os.listdir(modules_dir)):
+        if not name.endswith('.py') or name == '__init__.py':
+            continue
+        sources = []
+        for path in sorted(dependencies(os.path.join(modules_dir, name))):
+            with open(path) as f:
+                sources.append((path, f.read()))
+        eager = dependencies(os.path.join(modules_dir, name), pattern=EAGER_IMPORT_RE)
+        own = os.path.getsize(os.path.join(modules_dir, name))
+        raw = sum(len(source) for path, source in sources)
+        packed = sum(len(zlib.compress(source.encode('utf-8'), 6)) for path, source in sources)
+        compile_time = min(timeit.repeat(
+            lambda: [compile(source, path, 'exec') for path, source in sources if path in eager], number=20, repeat=3
+        )) / 20
+        totals[0] += own
+        totals[1] += raw
+        totals[2] += packed
+        totals[3] += compile_time
+        print('%-24s %8d %8d %8d %8.2fms' % (name[:-3], own, raw, packed, compile_time * 1000))
+    print('%-24s %8d %8d %8d %8.2fms' % ('total', totals[0], totals[1], totals[2], totals[3] * 1000))
+
+
+if __name__ == '__main__':
+    main()